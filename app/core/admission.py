@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import deque
+
+import anyio.to_thread
+from anyio import CapacityLimiter
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.handlers import RETRY_AFTER_SECONDS, error_response
+from app.core.stats import register_stats_provider
+from app.databaseConnector import configured_max_pool_size
+
+# Sync routes hold a pooled connection only for part of their run time, so a
+# small multiple of the pool size keeps connections busy without letting
+# dozens of threads pile up inside ``ConnectionPool.getconn``.
+ADMISSION_PER_CONNECTION = int(os.getenv("ADMISSION_PER_CONNECTION", "2"))
+ADMISSION_MAX_CONCURRENT = int(
+    os.getenv("ADMISSION_MAX_CONCURRENT") or configured_max_pool_size() * ADMISSION_PER_CONNECTION
+)
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "50"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+ADMISSION_EXEMPT_PATHS = frozenset(
+    path.strip() for path in os.getenv("ADMISSION_EXEMPT_PATHS", "/health,/health/ready,/system/metrics").split(",")
+    if path.strip()
+)
+# Admitted requests plus headroom for background tasks and streaming iterators.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE") or ADMISSION_MAX_CONCURRENT + 8)
+
+logger = logging.getLogger("spacebattle.admission")
+
+
+class AdmissionController:
+    """Bound concurrent requests with a FIFO wait queue; must be used from one event loop.
+
+    Past ``limit`` requests wait up to ``queue_timeout`` seconds for a slot; when
+    ``max_queue`` requests are already waiting, new ones are rejected at once.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float) -> None:
+        if limit < 1:
+            raise ValueError("Admission limit must be at least 1")
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self.counters = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+        }
+        self.max_queue_depth = 0
+
+    def _reject(self, reason: str, message: str) -> ServiceUnavailableError:
+        self.counters[reason] += 1
+        return ServiceUnavailableError(message, headers={"Retry-After": RETRY_AFTER_SECONDS})
+
+    async def acquire(self) -> None:
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            self.counters["admitted"] += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("rejected_queue_full", "Server busy, retry shortly")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters["queued"] += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            raise self._reject("rejected_timeout", "Server busy, retry shortly") from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the client went away.
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        self.counters["admitted"] += 1
+
+    def _discard(self, waiter: asyncio.Future[None]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self) -> None:
+        # Hand the slot straight to the oldest live waiter so queued requests keep FIFO order.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self) -> dict[str, int | float]:
+        limiter = _thread_limiter
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            **self.counters,
+            "threadpool_size": limiter.total_tokens if limiter is not None else 0,
+            "threadpool_busy": limiter.borrowed_tokens if limiter is not None else 0,
+        }
+
+
+admission = AdmissionController(ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT)
+register_stats_provider("admission", admission.stats)
+
+_thread_limiter: CapacityLimiter | None = None
+
+
+def configure_threadpool(size: int = THREADPOOL_SIZE) -> None:
+    """Resize AnyIO's default thread limiter (used by sync routes); call from the event loop."""
+    global _thread_limiter
+    _thread_limiter = anyio.to_thread.current_default_thread_limiter()
+    _thread_limiter.total_tokens = size
+    logger.info(
+        "Admission limit %d (queue %d), threadpool %d, database pool max %d",
+        admission.limit,
+        admission.max_queue,
+        size,
+        configured_max_pool_size(),
+    )
+
+
+class AdmissionMiddleware:
+    """Admit HTTP requests through :data:`admission`; shed the rest with 503 + Retry-After.
+
+    The rejection is rendered here because middleware errors never reach the
+    app's exception handlers. Probe and metrics paths bypass the limit.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController = admission) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in ADMISSION_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.controller.acquire()
+        except ServiceUnavailableError as exc:
+            await error_response(exc)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+import hashlib
 import os
+import time
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, ValidationError
 
+from app.core.request_context import current_request
+from app.core.stats import register_stats_provider
 from app.models.users import User, UserRole, UserLanguage
 from app.repositories import users as users_repo
+from app.util.cache import MISSING, TTLCache
 
 SECRET = os.getenv("JWT_SECRET", "dev-only-change-me")
 ALGO = "HS256"
 ACCESS_MIN = int(os.getenv("JWT_ACCESS_MIN", "15"))
+# Validated payloads kept by token digest until the token's own exp; 0 disables.
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -38,9 +45,19 @@ def _decode_token(token: str) -> dict:
         ) from exc
 
 
-def verify_token(token: str) -> TokenPayload:
-    """Decode a JWT and validate it against the expected payload schema."""
+_token_cache: TTLCache[bytes, TokenPayload] = TTLCache(TOKEN_CACHE_SIZE, ACCESS_MIN * 60)
+_token_counters = {"decodes": 0, "request_memo_hits": 0}
+
+
+def _token_stats() -> dict[str, float | int]:
+    return {**_token_cache.stats(), **_token_counters}
+
+
+register_stats_provider("token_cache", _token_stats)
 
+
+def _validate_token(token: str) -> TokenPayload:
+    _token_counters["decodes"] += 1
     raw = _decode_token(token)
     try:
         return TokenPayload.model_validate(raw)
@@ -51,6 +68,32 @@ def verify_token(token: str) -> TokenPayload:
         ) from exc
 
 
+def verify_token(token: str) -> TokenPayload:
+    """Decode a JWT and validate it against the expected payload schema.
+
+    A token is decoded at most once per request (request-scoped memo) and,
+    across requests, served from a digest-keyed cache until its ``exp``.
+    """
+
+    ctx = current_request()
+    if ctx is not None:
+        memo = ctx.tokens.get(token)
+        if memo is not None:
+            _token_counters["request_memo_hits"] += 1
+            return memo
+
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    payload = _token_cache.get(key)
+    if payload is MISSING:
+        payload = _validate_token(token)
+        # Convert the wall-clock exp into the cache's monotonic clock.
+        _token_cache.set(key, payload, expires_at=time.monotonic() + (payload.exp - time.time()))
+
+    if ctx is not None:
+        ctx.tokens[token] = payload
+    return payload
+
+
 def create_access_token(*, subject: int, role: UserRole, minutes: int = ACCESS_MIN, language: UserLanguage) -> str:
     """Create a signed JWT containing the user's id and role."""
 
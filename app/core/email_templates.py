@@ -1,47 +1,75 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from html import escape
+from string import Formatter
 from typing import Iterable
 import os
 
+APP_NAME = os.getenv("APP_NAME", "SPACEBATTLE").strip() or "SPACEBATTLE"
+DEFAULT_LANGUAGE = "de"
+
 
 def _join_lines(lines: Iterable[str]) -> str:
     return "\n\n".join(line.strip() for line in lines if line is not None and str(line).strip())
 
 
-def render_action_email_html(
-    *,
-    title: str,
-    heading: str,
-    body_lines: Iterable[str],
-    action_text: str,
-    action_url: str,
-    footer_lines: Iterable[str] | None = None,
-) -> str:
-    """Render a simple, dark-themed HTML email with a prominent CTA button.
+class CompiledTemplate:
+    """A template pre-split into static fragments and ``{slot}`` names.
 
-    Keeps inline styles for broad email client support and avoids external assets.
+    Rendering is a single ``join`` over the fragments; :meth:`partial` bakes
+    known values into the fragments so later renders only fill what is left.
     """
-    app_name = os.getenv("APP_NAME", "SPACEBATTLE").strip() or "SPACEBATTLE"
 
-    body_html = "".join(
-        f"<p style=\"margin:0 0 14px;line-height:1.6;color:#c7d2fe\">{line}</p>" for line in body_lines
-    )
+    __slots__ = ("_parts", "_slots")
 
-    notice_html = ""
-    if footer_lines:
-        notice_html = (
-            "<div style=\"margin-top:14px;border-radius:12px;border:1px solid rgba(16,185,129,.28);"
-            "background:rgba(16,185,129,.08);padding:10px 12px\">"
-            + "".join(
-                f"<p style=\"margin:0 0 6px;line-height:1.55;color:#bbf7d0;font-weight:600\">{line}</p>"
-                for line in footer_lines
-            )
-            + "</div>"
-        )
+    def __init__(self, source: str | None = None, *, parts: list[str] | None = None, slots: list[str] | None = None):
+        if source is not None:
+            parts, slots = [], []
+            pending: list[str] = []
+            for literal, field, _, _ in Formatter().parse(source):
+                pending.append(literal)
+                if field is not None:
+                    parts.append("".join(pending))
+                    slots.append(field)
+                    pending = []
+            parts.append("".join(pending))
+        self._parts: list[str] = parts or [""]
+        self._slots: list[str] = slots or []
 
-    return f"""
+    @property
+    def slots(self) -> tuple[str, ...]:
+        return tuple(self._slots)
+
+    def partial(self, **values: str) -> "CompiledTemplate":
+        parts: list[str] = []
+        slots: list[str] = []
+        pending = [self._parts[0]]
+        for slot, part in zip(self._slots, self._parts[1:]):
+            if slot in values:
+                pending.append(values[slot])
+            else:
+                parts.append("".join(pending))
+                slots.append(slot)
+                pending = []
+            pending.append(part)
+        parts.append("".join(pending))
+        return CompiledTemplate(parts=parts, slots=slots)
+
+    def render(self, **values: str) -> str:
+        parts = self._parts
+        if not self._slots:
+            return parts[0]
+        out = [parts[0]]
+        for slot, part in zip(self._slots, parts[1:]):
+            out.append(values[slot])
+            out.append(part)
+        return "".join(out)
+
+
+_ACTION_HTML = CompiledTemplate("""
 <!doctype html>
-<html lang=\"de\">
+<html lang=\"{lang}\">
   <head>
     <meta charset=\"utf-8\" />
     <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
@@ -53,7 +81,7 @@ def render_action_email_html(
         <td align=\"center\">
           <div style=\"font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto;text-transform:uppercase;letter-spacing:.18em;font-weight:800;color:#60a5fa;margin:10px 0 8px\">{app_name}</div>
           <div style=\"font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto;font-weight:900;color:#e5e7eb;font-size:28px;line-height:1.2;margin:0 0 8px\">{heading}</div>
-          <div style=\"font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto;color:#9fb6d0;margin:0 0 22px\">{_join_lines(body_lines)}</div>
+          <div style=\"font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto;color:#9fb6d0;margin:0 0 22px\">{summary}</div>
 
           <table role=\"presentation\" width=\"100%\" cellpadding=\"0\" cellspacing=\"0\" border=\"0\" style=\"max-width:620px\">
             <tr>
@@ -70,19 +98,175 @@ def render_action_email_html(
             </tr>
           </table>
 
-          <div style=\"color:#6b7280;font-size:12px;margin-top:14px;font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto\">Diese E‑Mail wurde automatisch versendet. Bitte nicht beantworten.</div>
+          <div style=\"color:#6b7280;font-size:12px;margin-top:14px;font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto\">{auto_notice}</div>
         </td>
       </tr>
     </table>
   </body>
   </html>
-    """.strip()
+""".strip()).partial(app_name=APP_NAME)
+
+_ACTION_TEXT = CompiledTemplate("{heading}\n\n{summary}\n\n{action_text}: {action_url}{footer}")
+
+_AUTO_NOTICE = {
+    "de": "Diese E‑Mail wurde automatisch versendet. Bitte nicht beantworten.",
+    "en": "This email was sent automatically. Please do not reply.",
+}
+
+
+def _notice_html(footer_lines: Iterable[str] | None) -> str:
+    if not footer_lines:
+        return ""
+    return (
+        "<div style=\"margin-top:14px;border-radius:12px;border:1px solid rgba(16,185,129,.28);"
+        "background:rgba(16,185,129,.08);padding:10px 12px\">"
+        + "".join(
+            f"<p style=\"margin:0 0 6px;line-height:1.55;color:#bbf7d0;font-weight:600\">{line}</p>"
+            for line in footer_lines
+        )
+        + "</div>"
+    )
+
+
+def render_action_email_html(
+    *,
+    title: str,
+    heading: str,
+    body_lines: Iterable[str],
+    action_text: str,
+    action_url: str,
+    footer_lines: Iterable[str] | None = None,
+    language: str = DEFAULT_LANGUAGE,
+) -> str:
+    """Render a simple, dark-themed HTML email with a prominent CTA button.
+
+    Keeps inline styles for broad email client support and avoids external assets.
+    For the built-in emails prefer :func:`render_email`, which reuses pre-rendered variants.
+    """
+    return _ACTION_HTML.render(
+        lang=language,
+        title=title,
+        heading=heading,
+        summary=_join_lines(body_lines),
+        action_url=action_url,
+        action_text=action_text,
+        notice_html=_notice_html(footer_lines),
+        auto_notice=_AUTO_NOTICE.get(language, _AUTO_NOTICE[DEFAULT_LANGUAGE]),
+    )
 
 
 def render_action_email_text(
     *, heading: str, body_lines: Iterable[str], action_text: str, action_url: str, footer_lines: Iterable[str] | None = None
 ) -> str:
-    parts: list[str] = [heading, "", _join_lines(body_lines), "", f"{action_text}: {action_url}"]
-    if footer_lines:
-        parts.extend(["", _join_lines(footer_lines)])
-    return "\n".join([p for p in parts if p is not None])
+    footer = "\n\n" + _join_lines(footer_lines) if footer_lines else ""
+    return _ACTION_TEXT.render(
+        heading=heading,
+        summary=_join_lines(body_lines),
+        action_text=action_text,
+        action_url=action_url,
+        footer=footer,
+    )
+
+
+@dataclass(frozen=True)
+class EmailContent:
+    subject: str
+    heading: str
+    body_lines: tuple[str, ...]
+    action_text: str
+    footer_lines: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    text: str
+    html: str
+
+
+EMAIL_CONTENT: dict[str, dict[str, EmailContent]] = {
+    "password_reset": {
+        "de": EmailContent(
+            subject="Passwort zurücksetzen",
+            heading="Passwort zurücksetzen",
+            body_lines=(
+                "Wir haben eine Anfrage zum Zurücksetzen deines Passworts erhalten.",
+                "Wenn du das warst, klicke auf den Button unten.",
+                "Wenn du diese Anfrage nicht gestellt hast, ignoriere diese E‑Mail.",
+            ),
+            action_text="Passwort jetzt zurücksetzen",
+            footer_lines=("Aus Sicherheitsgründen läuft der Link nach einiger Zeit ab.",),
+        ),
+        "en": EmailContent(
+            subject="Reset your password",
+            heading="Reset password",
+            body_lines=(
+                "We received a request to reset your password.",
+                "If that was you, click the button below.",
+                "If you did not request this, you can ignore this email.",
+            ),
+            action_text="Reset password now",
+            footer_lines=("For security reasons the link expires after a while.",),
+        ),
+    },
+    "verify_email": {
+        "de": EmailContent(
+            subject="E-Mail-Adresse bestätigen",
+            heading="E-Mail bestätigen",
+            body_lines=("Bitte bestätige deine E-Mail-Adresse, um dein Konto zu aktivieren.",),
+            action_text="E-Mail jetzt bestätigen",
+            footer_lines=("Falls du dich nicht registriert hast, ignoriere diese E-Mail.",),
+        ),
+        "en": EmailContent(
+            subject="Confirm your email address",
+            heading="Confirm email",
+            body_lines=("Please confirm your email address to activate your account.",),
+            action_text="Confirm email now",
+            footer_lines=("If you did not sign up, you can ignore this email.",),
+        ),
+    },
+}
+
+
+class EmailTemplateRegistry:
+    """Pre-renders every template/language variant so only ``action_url`` is filled per send."""
+
+    def __init__(self, content: dict[str, dict[str, EmailContent]] = EMAIL_CONTENT) -> None:
+        self._variants: dict[tuple[str, str], tuple[str, CompiledTemplate, CompiledTemplate]] = {}
+        for name, languages in content.items():
+            for language, c in languages.items():
+                html = _ACTION_HTML.partial(
+                    lang=language,
+                    title=c.subject,
+                    heading=c.heading,
+                    summary=_join_lines(c.body_lines),
+                    action_text=c.action_text,
+                    notice_html=_notice_html(c.footer_lines),
+                    auto_notice=_AUTO_NOTICE.get(language, _AUTO_NOTICE[DEFAULT_LANGUAGE]),
+                )
+                text = _ACTION_TEXT.partial(
+                    heading=c.heading,
+                    summary=_join_lines(c.body_lines),
+                    action_text=c.action_text,
+                    footer="\n\n" + _join_lines(c.footer_lines) if c.footer_lines else "",
+                )
+                self._variants[(name, language)] = (c.subject, text, html)
+
+    def render(self, name: str, language: str | None, *, action_url: str) -> RenderedEmail:
+        """Render template ``name``; unknown languages fall back to :data:`DEFAULT_LANGUAGE`."""
+        variant = self._variants.get((name, language or DEFAULT_LANGUAGE))
+        if variant is None:
+            variant = self._variants[(name, DEFAULT_LANGUAGE)]
+        subject, text, html = variant
+        return RenderedEmail(
+            subject=subject,
+            text=text.render(action_url=action_url),
+            html=html.render(action_url=escape(action_url, quote=True)),
+        )
+
+
+templates = EmailTemplateRegistry()
+
+
+def render_email(name: str, language: str | None, *, action_url: str) -> RenderedEmail:
+    return templates.render(name, language, action_url=action_url)
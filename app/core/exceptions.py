@@ -3,9 +3,10 @@ from app.core.errors import AppErrorCode, AppHttpStatus
 class AppError(Exception):
     status: AppHttpStatus = AppHttpStatus.INTERNAL
     code: AppErrorCode = AppErrorCode.INTERNAL
-    def __init__(self, message: str, *, details: dict | None = None):
+    def __init__(self, message: str, *, details: dict | None = None, headers: dict[str, str] | None = None):
         super().__init__(message)
         self.details = details
+        self.headers = headers
 
 # 4xx – Clientfehler
 class BadRequestError(AppError):
@@ -1,12 +1,16 @@
 # app/core/handlers.py
 import logging
 from fastapi import FastAPI, Request
-from starlette.responses import JSONResponse
-from app.core.exceptions import AppError
-from app.core.errors import ErrorResponse
+from psycopg_pool import PoolTimeout
+from app.core.exceptions import AppError, ServiceUnavailableError
+from app.core.errors import AppHttpStatus, ErrorResponse
+from app.core.responses import FastJSONResponse
 
 logger = logging.getLogger("spacebattle.api")
 
+# Sekunden, die Clients bei Überlast warten sollen (Retry-After)
+RETRY_AFTER_SECONDS = "1"
+
 def _build_context(request: Request, exc: AppError) -> dict:
     # alles, was beim Debug hilft – ohne Secrets!
     return {
@@ -17,15 +21,30 @@ def _build_context(request: Request, exc: AppError) -> dict:
         "code": str(exc.code),
     }
 
+def error_response(exc: AppError) -> FastJSONResponse:
+    """Render ``exc`` in the API error format; also used by middleware outside the handlers."""
+    payload = ErrorResponse(code=exc.code, message=str(exc), details=exc.details)
+    # Rendered straight from the model, without the model_dump() -> json.dumps round trip.
+    return FastJSONResponse(status_code=int(exc.status), content=payload, headers=exc.headers)
+
 def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(AppError)
     async def app_error_handler(request: Request, exc: AppError):
         ctx = _build_context(request, exc)
-        # 5xx laut loggen, 4xx eher informativ
-        if int(exc.status) >= 500:
+        # 5xx laut loggen, 4xx eher informativ; 503 ist gewollte Lastabwehr, kein Stacktrace
+        if int(exc.status) == AppHttpStatus.SERVICE_UNAVAILABLE:
+            logger.warning("Service unavailable: %s", exc, extra=ctx)
+        elif int(exc.status) >= 500:
             logger.exception("Unhandled server error", extra=ctx)
         else:
             logger.info("Handled app error", extra=ctx)
 
-        payload = ErrorResponse(code=exc.code, message=str(exc), details=exc.details)
-        return JSONResponse(status_code=int(exc.status), content=payload.model_dump())
+        return error_response(exc)
+
+    @app.exception_handler(PoolTimeout)
+    async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+        # Kein freier DB-Connection-Slot innerhalb von DATABASE_POOL_TIMEOUT
+        error = ServiceUnavailableError(
+            "Database busy, retry shortly", headers={"Retry-After": RETRY_AFTER_SECONDS}
+        )
+        return await app_error_handler(request, error)
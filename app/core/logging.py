@@ -1,13 +1,145 @@
 # app/core/logging.py
+import json
 import logging
+import os
 import sys
+import time
+from threading import Lock
 
-def setup_logging(level: str = "INFO") -> None:
-    fmt = "%(asctime)s %(levelname)s %(name)s %(message)s"
-    datefmt = "%Y-%m-%dT%H:%M:%S%z"
+from app.core.request_context import current_request
+from app.core.stats import register_stats_provider
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "text" (default) or "json"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip().lower()
+# Per-logger overrides, e.g. "spacebattle.db.queries=DEBUG,uvicorn.access=WARNING"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Records per second and burst allowed per (logger, message template) at INFO and below; 0 disables sampling.
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "20"))
+LOG_SAMPLE_BURST = float(os.getenv("LOG_SAMPLE_BURST", "100"))
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line, including ``extra=`` fields and the request id."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._second: tuple[int, str] = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        cached = self._second
+        if cached[0] != second:
+            cached = self._second = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+        return f"{cached[1]}.{int((created - second) * 1000):03d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self._timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        ctx = current_request()
+        if ctx is not None:
+            payload["request_id"] = ctx.request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Token-bucket sampling per (logger, message template) for records up to ``max_level``.
+
+    Warnings and errors always pass. When a bucket refills after dropping
+    records, the next record carries ``suppressed=<count>``.
+    """
+
+    MAX_KEYS = 10_000
+
+    def __init__(self, rate: float, burst: float, max_level: int = logging.INFO) -> None:
+        super().__init__()
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_level = max_level
+        self._buckets: dict[tuple[str, object], list[float]] = {}
+        self._lock = Lock()
+        self.passed = 0
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or self.rate <= 0:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_KEYS:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.dropped += 1
+                return False
+            bucket[0] = tokens - 1
+            suppressed = int(bucket[2])
+            bucket[2] = 0
+            self.passed += 1
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+    def stats(self) -> dict[str, float | int]:
+        return {"rate": self.rate, "burst": self.burst, "passed": self.passed, "dropped": self.dropped}
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    levels: dict[str, str] = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_sampler: SamplingFilter | None = None
+
+
+def _sampling_stats() -> dict[str, float | int]:
+    return _sampler.stats() if _sampler is not None else {}
+
+
+register_stats_provider("logging", _sampling_stats)
+
+
+def setup_logging(level: str | None = None, *, log_format: str | None = None) -> None:
+    global _sampler
+
+    log_format = log_format or LOG_FORMAT
     handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        fmt = "%(asctime)s %(levelname)s %(name)s %(message)s"
+        datefmt = "%Y-%m-%dT%H:%M:%S%z"
+        handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
+    _sampler = SamplingFilter(LOG_SAMPLE_RATE, LOG_SAMPLE_BURST)
+    handler.addFilter(_sampler)
     root = logging.getLogger()
     root.handlers.clear()
     root.addHandler(handler)
-    root.setLevel(level.upper())
+    root.setLevel((level or LOG_LEVEL).upper())
+    for name, logger_level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(logger_level)
@@ -1,5 +1,9 @@
-import os, smtplib, ssl
+import os, smtplib, ssl, time
 from email.message import EmailMessage
+from threading import BoundedSemaphore, Lock
+from typing import Sequence
+
+from app.core.stats import register_stats_provider
 
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
@@ -7,8 +11,39 @@ SMTP_USER = os.getenv("SMTP_USER", "")
 SMTP_PASS = os.getenv("SMTP_PASS", "")
 MAIL_FROM = os.getenv("MAIL_FROM", SMTP_USER)
 SMTP_SSL = os.getenv("SMTP_SSL", "false").lower() == "true"  # optional
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"  # false only for local stand-ins
+MAIL_BACKEND = os.getenv("MAIL_BACKEND", "smtp").lower()  # smtp | memory
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_MAX_MESSAGES_PER_SESSION = int(os.getenv("SMTP_MAX_MESSAGES_PER_SESSION", "100"))
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))  # servers drop idle sessions
+SMTP_NOOP_AFTER = float(os.getenv("SMTP_NOOP_AFTER", "5"))  # probe sessions idle longer than this
 
-def send_mail(to: str, subject: str, text: str, html: str | None = None):
+
+class MemoryMailbox:
+    """In-process sink used with MAIL_BACKEND=memory (tests, local development)."""
+
+    def __init__(self) -> None:
+        self._messages: list[EmailMessage] = []
+        self._lock = Lock()
+
+    def deliver(self, msg: EmailMessage) -> None:
+        with self._lock:
+            self._messages.append(msg)
+
+    @property
+    def messages(self) -> list[EmailMessage]:
+        with self._lock:
+            return list(self._messages)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._messages.clear()
+
+
+mailbox = MemoryMailbox()
+
+
+def build_message(to: str, subject: str, text: str, html: str | None = None) -> EmailMessage:
     msg = EmailMessage()
     msg["From"] = MAIL_FROM or SMTP_USER
     msg["To"] = to
@@ -16,18 +51,201 @@ def send_mail(to: str, subject: str, text: str, html: str | None = None):
     msg.set_content(text)
     if html:
         msg.add_alternative(html, subtype="html")
+    return msg
 
+
+def _connect() -> smtplib.SMTP:
     if SMTP_SSL:  # Port 465
-        with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, context=ssl.create_default_context()) as s:
-            if SMTP_USER:
-                s.login(SMTP_USER, SMTP_PASS)
-            s.send_message(msg)
+        s: smtplib.SMTP = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, context=ssl.create_default_context())
     else:         # Port 587 STARTTLS
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as s:
-            s.ehlo()
+        s = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+    try:
+        s.ehlo()
+        if not SMTP_SSL and SMTP_STARTTLS:
             s.starttls(context=ssl.create_default_context())
             s.ehlo()
-            if SMTP_USER:
-                s.login(SMTP_USER, SMTP_PASS)
-            s.send_message(msg)
+        if SMTP_USER:
+            s.login(SMTP_USER, SMTP_PASS)
+    except Exception:
+        s.close()
+        raise
+    return s
+
+
+class _Session:
+    __slots__ = ("smtp", "sent", "last_used")
+
+    def __init__(self, smtp: smtplib.SMTP) -> None:
+        self.smtp = smtp
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+def _close_quietly(session: _Session) -> None:
+    try:
+        session.smtp.quit()
+    except Exception:
+        session.smtp.close()
+
+
+class SmtpPool:
+    """Keeps up to ``size`` authenticated SMTP sessions alive across messages.
+
+    Sessions are recycled after ``max_messages`` sends or ``idle_timeout``
+    seconds of inactivity; sessions idle for more than ``noop_after`` seconds
+    are probed with NOOP and replaced if the server has dropped them.
+    """
 
+    def __init__(
+        self,
+        *,
+        size: int = SMTP_POOL_SIZE,
+        max_messages: int = SMTP_MAX_MESSAGES_PER_SESSION,
+        idle_timeout: float = SMTP_IDLE_TIMEOUT,
+        noop_after: float = SMTP_NOOP_AFTER,
+    ) -> None:
+        self._slots = BoundedSemaphore(size)
+        self._idle: list[_Session] = []
+        self._lock = Lock()
+        self._size = size
+        self._max_messages = max_messages
+        self._idle_timeout = idle_timeout
+        self._noop_after = noop_after
+        self.counters = {
+            "connects": 0,
+            "reuses": 0,
+            "dead_sessions": 0,
+            "recycled": 0,
+            "sent": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+        self._send_seconds = 0.0
+
+    def _alive(self, session: _Session) -> bool:
+        idle = time.monotonic() - session.last_used
+        if idle > self._idle_timeout:
+            return False
+        if idle <= self._noop_after:
+            return True
+        try:
+            return session.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _checkout(self) -> _Session:
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                self.counters["connects"] += 1
+                return _Session(_connect())
+            if self._alive(session):
+                self.counters["reuses"] += 1
+                return session
+            self.counters["dead_sessions"] += 1
+            _close_quietly(session)
+
+    def _checkin(self, session: _Session) -> None:
+        session.last_used = time.monotonic()
+        if session.sent >= self._max_messages:
+            self.counters["recycled"] += 1
+            _close_quietly(session)
+            return
+        with self._lock:
+            self._idle.append(session)
+
+    def _send_on(self, session: _Session, msg: EmailMessage) -> None:
+        started = time.perf_counter()
+        session.smtp.send_message(msg)
+        self._send_seconds += time.perf_counter() - started
+        session.sent += 1
+        self.counters["sent"] += 1
+
+    def send(self, msg: EmailMessage) -> None:
+        error = self.send_batch([msg])[0]
+        if error is not None:
+            raise error
+
+    def send_batch(self, msgs: Sequence[EmailMessage]) -> list[Exception | None]:
+        """Send ``msgs`` over as few sessions as possible; returns one error (or None) per message.
+
+        Recipient/message rejections are reported per message without ending the
+        batch. A session dropped mid-batch is replaced and the message retried
+        once; if no session can be opened at all, the rest of the batch fails.
+        """
+        results: list[Exception | None] = [None] * len(msgs)
+        index = 0
+        retried = -1
+        self.counters["batches"] += 1
+        with self._slots:
+            while index < len(msgs):
+                try:
+                    session = self._checkout()
+                except (smtplib.SMTPException, OSError) as exc:
+                    self.counters["failed"] += len(msgs) - index
+                    results[index:] = [exc] * (len(msgs) - index)
+                    break
+
+                try:
+                    while index < len(msgs) and session.sent < self._max_messages:
+                        try:
+                            self._send_on(session, msgs[index])
+                        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as exc:
+                            self.counters["failed"] += 1
+                            results[index] = exc
+                        index += 1
+                except (smtplib.SMTPException, OSError) as exc:
+                    self.counters["dead_sessions"] += 1
+                    _close_quietly(session)
+                    if retried == index:
+                        self.counters["failed"] += 1
+                        results[index] = exc
+                        index += 1
+                    else:
+                        retried = index
+                    continue
+
+                self._checkin(session)
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            _close_quietly(session)
+
+    def stats(self) -> dict[str, float | int]:
+        sent = self.counters["sent"]
+        return {
+            **self.counters,
+            "size": self._size,
+            "idle": len(self._idle),
+            "send_seconds": round(self._send_seconds, 3),
+            "avg_send_ms": round(self._send_seconds / sent * 1000, 3) if sent else 0.0,
+            "messages_per_second": round(sent / self._send_seconds, 1) if self._send_seconds else 0.0,
+        }
+
+
+smtp_pool = SmtpPool()
+
+register_stats_provider("smtp_pool", smtp_pool.stats)
+
+
+def send_messages(msgs: Sequence[EmailMessage]) -> list[Exception | None]:
+    """Deliver a batch through the configured backend; one error (or None) per message."""
+    if MAIL_BACKEND == "memory":
+        for msg in msgs:
+            mailbox.deliver(msg)
+        return [None] * len(msgs)
+    return smtp_pool.send_batch(msgs)
+
+
+def send_message(msg: EmailMessage) -> None:
+    error = send_messages([msg])[0]
+    if error is not None:
+        raise error
+
+
+def send_mail(to: str, subject: str, text: str, html: str | None = None):
+    send_message(build_message(to, subject, text, html))
@@ -0,0 +1,294 @@
+"""In-process metrics with Prometheus text exposition.
+
+Every worker process keeps its own registry. With ``METRICS_MULTIPROC_DIR``
+set, each worker also writes a JSON snapshot of its registry to that directory
+every ``METRICS_FLUSH_INTERVAL`` seconds, and the worker serving
+``/system/metrics`` merges all snapshots. Counters and histograms are summed
+across workers; the stats-provider gauges get a ``pid`` label because ratios
+cannot be summed. A worker removes its file on shutdown; clear the directory
+when deploying so snapshots of killed processes do not linger.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import time
+from bisect import bisect_left
+from pathlib import Path
+from threading import Lock
+from typing import Any, Iterable, Mapping
+
+from app.core.stats import collect_stats
+
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "").strip() or None
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+logger = logging.getLogger("spacebattle.metrics")
+
+_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            samples = [[list(labels), self._copy(value)] for labels, value in self._values.items()]
+        return {"type": self.kind, "help": self.documentation, "labels": list(self.labelnames), "samples": samples}
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """A gauge; in-flight style gauges are summed across workers."""
+
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; stores per-bucket counts, cumulated on render."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return [list(value[0]), value[1], value[2]]
+
+    def _snapshot(self) -> dict[str, Any]:
+        snapshot = super()._snapshot()
+        snapshot["buckets"] = list(self.buckets)
+        return snapshot
+
+
+class MetricsRegistry:
+    def __init__(self, multiproc_dir: str | None = METRICS_MULTIPROC_DIR) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._dir = Path(multiproc_dir) if multiproc_dir else None
+        self._task: asyncio.Task | None = None
+
+    def _register(self, metric: _Metric) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    # --- snapshots ---
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return this process' metrics, including the stats providers as gauges."""
+        families = {name: metric._snapshot() for name, metric in self._metrics.items()}
+        for name, value in _flatten_stats(collect_stats()):
+            families[name] = {"type": "gauge", "help": "Runtime statistic from /system/stats.",
+                              "labels": [], "samples": [[[], value]], "per_process": True}
+        return families
+
+    def _snapshot_path(self, pid: int) -> Path:
+        assert self._dir is not None
+        return self._dir / f"metrics-{pid}.json"
+
+    def write_snapshot(self) -> None:
+        if self._dir is None:
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"pid": os.getpid(), "written": time.time(), "metrics": self.snapshot()}))
+        os.replace(tmp, path)
+
+    def _collect(self) -> dict[str, dict[str, Any]]:
+        if self._dir is None:
+            return self.snapshot()
+        pid = os.getpid()
+        snapshots = [(pid, self.snapshot())]
+        for path in self._dir.glob("metrics-*.json"):
+            if path == self._snapshot_path(pid):
+                continue
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            snapshots.append((int(data.get("pid", 0)), data.get("metrics", {})))
+        return _merge(snapshots)
+
+    def render(self) -> str:
+        return render_prometheus(self._collect())
+
+    # --- lifecycle ---
+
+    async def start(self) -> None:
+        if self._dir is None or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._flush_loop(), name="metrics-flush")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._dir is not None:
+            # A stopped worker's requests are gone from the aggregate, like any counter reset.
+            self._snapshot_path(os.getpid()).unlink(missing_ok=True)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.write_snapshot)
+            except Exception:
+                logger.exception("Failed to write metrics snapshot")
+            await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+
+
+def _flatten_stats(stats: Mapping[str, Any], prefix: str = "") -> Iterable[tuple[str, float]]:
+    for key, value in stats.items():
+        name = _NAME_INVALID.sub("_", f"{prefix}{key}")
+        if isinstance(value, Mapping):
+            yield from _flatten_stats(value, f"{name}_")
+        elif isinstance(value, (bool, int, float)):
+            yield name, float(value)
+
+
+def _merge(snapshots: list[tuple[int, Mapping[str, dict[str, Any]]]]) -> dict[str, dict[str, Any]]:
+    merged: dict[str, dict[str, Any]] = {}
+    for pid, families in snapshots:
+        for name, family in families.items():
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = {k: v for k, v in family.items() if k != "samples"}
+                target["values"] = {}
+                if family.get("per_process"):
+                    target["labels"] = [*family["labels"], "pid"]
+            values = target["values"]
+            for labels, value in family["samples"]:
+                key = (*labels, str(pid)) if family.get("per_process") else tuple(labels)
+                current = values.get(key)
+                if current is None:
+                    values[key] = value
+                elif family["type"] == "histogram":
+                    values[key] = [[a + b for a, b in zip(current[0], value[0])], current[1] + value[1], current[2] + value[2]]
+                else:
+                    values[key] = current + value
+    for family in merged.values():
+        family["samples"] = [[list(key), value] for key, value in family.pop("values").items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus(families: Mapping[str, dict[str, Any]]) -> str:
+    """Render snapshot families in the Prometheus text exposition format 0.0.4."""
+    lines: list[str] = []
+    for name in sorted(families):
+        family = families[name]
+        kind = family["type"]
+        labelnames = family["labels"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in family["samples"]:
+            if kind != "histogram":
+                lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip([*family["buckets"], math.inf], counts):
+                cumulative += bucket_count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{name}_bucket{_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labelnames, labels)} {count}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter("http_requests_total", "HTTP requests by method, route and status.", ("method", "route", "status"))
+HTTP_LATENCY = registry.histogram("http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+HTTP_IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+DB_POOL_WAIT = registry.histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled database connection.", ("pool",), POOL_WAIT_BUCKETS
+)
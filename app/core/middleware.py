@@ -1,33 +1,134 @@
 from __future__ import annotations
 
+import logging
+import time
 import uuid
-from typing import Awaitable, Callable
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.admission import AdmissionMiddleware
 from app.core.cors import get_allowed_origins
+from app.core.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+from app.core.request_context import RequestContext, request_scope
 
 REQUEST_ID_HEADER = "X-Request-ID"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SERVER_TIMING_HEADER = "Server-Timing"
 
+_REQUEST_ID_KEY = REQUEST_ID_HEADER.lower().encode("latin-1")
+_REQUEST_ID_NAME = REQUEST_ID_HEADER.encode("latin-1")
+_SERVER_TIMING_NAME = SERVER_TIMING_HEADER.encode("latin-1")
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers[REQUEST_ID_HEADER] = request_id
-        return response
+access_logger = logging.getLogger("spacebattle.access")
+
+
+def _server_timing(ctx: RequestContext) -> bytes:
+    entries = [f"{name};dur={duration:.1f}" for name, duration in ctx.timings.items()]
+    entries.append(f"app;dur={ctx.elapsed_ms():.1f}")
+    return ", ".join(entries).encode("latin-1")
+
+
+class RequestContextMiddleware:
+    """Open a :class:`RequestContext` per HTTP request and stamp response headers.
+
+    Plain ASGI rather than ``BaseHTTPMiddleware``: no extra task or body
+    re-wrapping, so streaming responses pass through untouched. Headers are
+    added on ``http.response.start``; ``Server-Timing`` therefore measures time
+    to first byte, together with any timings recorded on the context.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == _REQUEST_ID_KEY:
+                request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        with request_scope(request_id) as ctx:
+            status = 500
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = list(message.get("headers", ()))
+                    headers.append((_REQUEST_ID_NAME, request_id.encode("latin-1")))
+                    headers.append((_SERVER_TIMING_NAME, _server_timing(ctx)))
+                    message["headers"] = headers
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Server errors go out at WARNING, which sampling never drops.
+                level = logging.WARNING if status >= 500 else logging.INFO
+                if access_logger.isEnabledFor(level):
+                    route = getattr(scope.get("route"), "path", None)
+                    duration_ms = round(ctx.elapsed_ms(), 1)
+                    access_logger.log(
+                        level,
+                        "%s %s -> %s (%.1f ms)",
+                        scope["method"],
+                        scope["path"],
+                        status,
+                        duration_ms,
+                        extra={"method": scope["method"], "route": route, "status": status, "duration_ms": duration_ms},
+                    )
+
+
+class MetricsMiddleware:
+    """Count requests and observe latency per route template.
+
+    The route label is the matched path template (``/users/{user_id}``) so the
+    number of series stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - started, method, route)
+            HTTP_REQUESTS.inc(method, route, status)
 
 
 def register_middlewares(app: FastAPI) -> None:
-    app.add_middleware(RequestIdMiddleware)
+    # Innermost first: admission sits inside metrics/context so shed requests
+    # are still counted, carry a request id and get CORS headers.
+    app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(RequestContextMiddleware)
 
     app.add_middleware(
         CORSMiddleware,
@@ -35,6 +136,6 @@ def register_middlewares(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=[REQUEST_ID_HEADER],
+        expose_headers=[REQUEST_ID_HEADER, NEXT_CURSOR_HEADER, SERVER_TIMING_HEADER],
         max_age=600,
     )
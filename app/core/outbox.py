@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.mailer import build_message, send_messages
+from app.core.stats import register_stats_provider
+
+MAIL_OUTBOX_SIZE = int(os.getenv("MAIL_OUTBOX_SIZE", "1000"))
+MAIL_OUTBOX_WORKERS = int(os.getenv("MAIL_OUTBOX_WORKERS", "2"))
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "20"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+MAIL_RETRY_BASE_DELAY = float(os.getenv("MAIL_RETRY_BASE_DELAY", "2"))
+MAIL_RETRY_MAX_DELAY = float(os.getenv("MAIL_RETRY_MAX_DELAY", "300"))
+MAIL_DRAIN_TIMEOUT = float(os.getenv("MAIL_DRAIN_TIMEOUT", "10"))
+
+logger = logging.getLogger("spacebattle.mail")
+
+
+@dataclass
+class OutgoingMail:
+    to: str
+    subject: str
+    text: str
+    html: str | None = None
+    attempts: int = 0
+    last_error: str | None = None
+    enqueued_at: float = field(default_factory=time.time)
+
+
+class MailOutbox:
+    """In-process mail queue drained by background workers on the event loop.
+
+    Routes enqueue and return immediately; workers take whatever is queued (up
+    to ``batch_size``) and deliver it as one batch on the threadpool, retry
+    failures with exponential backoff and jitter, and move messages that
+    exhaust ``max_attempts`` to a bounded dead-letter list.
+    """
+
+    def __init__(
+        self,
+        sender: Callable[[list[OutgoingMail]], list[Exception | None]],
+        *,
+        max_size: int = MAIL_OUTBOX_SIZE,
+        workers: int = MAIL_OUTBOX_WORKERS,
+        batch_size: int = MAIL_BATCH_SIZE,
+        max_attempts: int = MAIL_MAX_ATTEMPTS,
+        base_delay: float = MAIL_RETRY_BASE_DELAY,
+        max_delay: float = MAIL_RETRY_MAX_DELAY,
+        dead_letter_size: int = 100,
+    ) -> None:
+        self._sender = sender
+        self._max_size = max_size
+        self._workers = workers
+        self._batch_size = max(batch_size, 1)
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._queue: asyncio.Queue[OutgoingMail] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._retry_handles: set[asyncio.TimerHandle] = set()
+        self.dead_letters: deque[OutgoingMail] = deque(maxlen=dead_letter_size)
+        self.counters = {"enqueued": 0, "sent": 0, "failed_attempts": 0, "retries": 0, "dead_lettered": 0, "rejected": 0}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+        self._tasks = [asyncio.create_task(self._work(), name=f"mail-outbox-{i}") for i in range(self._workers)]
+
+    async def stop(self, drain_timeout: float = MAIL_DRAIN_TIMEOUT) -> None:
+        """Give queued mail ``drain_timeout`` seconds to go out, then cancel the workers."""
+        if not self._tasks or self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Mail outbox stopped with %s message(s) undelivered", self._queue.qsize())
+        for handle in self._retry_handles:
+            handle.cancel()
+        if self._retry_handles:
+            logger.warning("Mail outbox dropped %s pending retr(ies) on shutdown", len(self._retry_handles))
+        self._retry_handles.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def enqueue(self, mail: OutgoingMail) -> None:
+        """Queue ``mail`` for delivery; must be called from the event loop."""
+        if self._queue is None:
+            raise ServiceUnavailableError("Mail outbox is not running")
+        try:
+            self._queue.put_nowait(mail)
+        except asyncio.QueueFull as exc:
+            self.counters["rejected"] += 1
+            raise ServiceUnavailableError("Mail outbox is full") from exc
+        self.counters["enqueued"] += 1
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay = min(self._base_delay * 2 ** (attempts - 1), self._max_delay)
+        return delay * random.uniform(0.8, 1.2)
+
+    def _schedule_retry(self, mail: OutgoingMail) -> None:
+        loop = asyncio.get_running_loop()
+        handle: asyncio.TimerHandle
+
+        def requeue() -> None:
+            self._retry_handles.discard(handle)
+            if self._queue is None:
+                return
+            try:
+                self._queue.put_nowait(mail)
+            except asyncio.QueueFull:
+                self._dead_letter(mail, "outbox full on retry")
+
+        handle = loop.call_later(self._retry_delay(mail.attempts), requeue)
+        self._retry_handles.add(handle)
+        self.counters["retries"] += 1
+
+    def _dead_letter(self, mail: OutgoingMail, reason: str) -> None:
+        mail.last_error = mail.last_error or reason
+        self.dead_letters.append(mail)
+        self.counters["dead_lettered"] += 1
+        logger.error(
+            "Giving up on mail to %s (%r) after %s attempt(s): %s",
+            mail.to, mail.subject, mail.attempts, mail.last_error,
+        )
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._deliver(batch)
+            except Exception:
+                # Never let a bug in bookkeeping kill the worker.
+                logger.exception("Mail outbox worker failed to process a batch")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _deliver(self, batch: list[OutgoingMail]) -> None:
+        for mail in batch:
+            mail.attempts += 1
+        try:
+            results = await run_in_threadpool(self._sender, batch)
+        except Exception as exc:
+            results = [exc] * len(batch)
+
+        for mail, error in zip(batch, results):
+            if error is None:
+                self.counters["sent"] += 1
+                continue
+            self.counters["failed_attempts"] += 1
+            mail.last_error = f"{type(error).__name__}: {error}"
+            if mail.attempts >= self._max_attempts:
+                self._dead_letter(mail, mail.last_error)
+            else:
+                logger.warning("Mail to %s failed (attempt %s): %s", mail.to, mail.attempts, mail.last_error)
+                self._schedule_retry(mail)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.counters,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "scheduled_retries": len(self._retry_handles),
+            "dead_letters": [
+                {"to": m.to, "subject": m.subject, "attempts": m.attempts, "error": m.last_error}
+                for m in self.dead_letters
+            ],
+        }
+
+
+def _send(batch: list[OutgoingMail]) -> list[Exception | None]:
+    return send_messages([build_message(m.to, m.subject, m.text, m.html) for m in batch])
+
+
+outbox = MailOutbox(_send)
+
+register_stats_provider("mail_outbox", outbox.stats)
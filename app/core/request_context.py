@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Iterator
+
+
+@dataclass
+class RequestContext:
+    """Per-request scratch space shared by middleware, dependencies and helpers."""
+
+    request_id: str
+    tokens: dict[str, Any] = field(default_factory=dict)
+    started: float = field(default_factory=perf_counter)
+    timings: dict[str, float] = field(default_factory=dict)
+    queries: list[Any] = field(default_factory=list)
+    query_count: int = 0
+    query_shapes: dict[str, int] = field(default_factory=dict)
+
+    def add_timing(self, name: str, duration_ms: float) -> None:
+        """Accumulate ``duration_ms`` under ``name`` for the ``Server-Timing`` header."""
+        self.timings[name] = self.timings.get(name, 0.0) + duration_ms
+
+    def elapsed_ms(self) -> float:
+        return (perf_counter() - self.started) * 1000
+
+
+_current: ContextVar[RequestContext | None] = ContextVar("request_context", default=None)
+
+
+def current_request() -> RequestContext | None:
+    """Return the context of the request being served, if any.
+
+    AnyIO copies the context into worker threads, so sync routes and
+    dependencies see the same object as the middleware that created it.
+    """
+    return _current.get()
+
+
+def record_timing(name: str, duration_ms: float) -> None:
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.add_timing(name, duration_ms)
+
+
+@contextmanager
+def request_scope(request_id: str) -> Iterator[RequestContext]:
+    ctx = RequestContext(request_id=request_id)
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
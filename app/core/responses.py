@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Any, Callable, get_args, get_origin
+
+import pydantic_core
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import JSONResponse, Response
+from starlette.routing import request_response
+
+# Keyword under which FastAPI hands the sub-response to endpoints that do not declare one.
+_SUB_RESPONSE_PARAM = "_fast_sub_response"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON rendered by pydantic-core in a single pass (models, datetimes and enums included).
+
+    ``bytes`` content is taken as already-serialised JSON and sent unchanged.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return pydantic_core.to_json(content)
+
+
+def _trusted_check(annotation: Any) -> Callable[[Any], bool] | None:
+    """Recognise return values that are exactly ``response_model`` already.
+
+    Only ``Model`` and ``list[Model]`` qualify, matched by exact type: a subclass
+    may carry fields the response model is meant to filter out.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda content: type(content) is annotation
+    if get_origin(annotation) is list:
+        (item,) = get_args(annotation) or (None,)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return lambda content: type(content) is list and all(type(x) is item for x in content)
+    return None
+
+
+class TrustedResponseRoute(APIRoute):
+    """Serialise trusted endpoint results once, straight to JSON bytes.
+
+    FastAPI validates every return value against ``response_model`` (on an extra
+    threadpool hop for sync endpoints), dumps it to Python objects and encodes
+    those again. Repository models are valid by construction, so when an
+    endpoint returns exactly ``response_model`` (or a list of it) this route
+    dumps it with pydantic-core and returns the bytes as the response. Anything
+    else, and routes using ``response_model_include``/``exclude*`` options,
+    take FastAPI's regular path.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, endpoint, **kwargs)
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if self.response_field is None or not issubclass(response_class, FastJSONResponse):
+            return
+        if (
+            self.response_model_include is not None
+            or self.response_model_exclude is not None
+            or self.response_model_exclude_unset
+            or self.response_model_exclude_defaults
+            or self.response_model_exclude_none
+        ):
+            return
+        is_trusted = _trusted_check(self.response_field.type_)
+        if is_trusted is None:
+            return
+
+        adapter = TypeAdapter(self.response_field.type_)
+        by_alias = self.response_model_by_alias
+        status_code = self.status_code
+
+        def render(content: Any, sub_response: Response) -> Any:
+            if not is_trusted(content):
+                return content
+            # Same status and header handling FastAPI applies to serialised results.
+            code = sub_response.status_code or status_code or 200
+            body = adapter.dump_json(content, by_alias=by_alias) if is_body_allowed_for_status_code(code) else b""
+            response = response_class(body, status_code=code)
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+
+        dependant = self.dependant
+        call = dependant.call
+        declared = dependant.response_param_name
+        param = declared or _SUB_RESPONSE_PARAM
+
+        def take_sub_response(kwargs: dict[str, Any]) -> Response:
+            return kwargs[param] if declared else kwargs.pop(param)
+
+        if asyncio.iscoroutinefunction(call):
+
+            @functools.wraps(call)
+            async def trusted_call(**kwargs: Any) -> Any:
+                sub_response = take_sub_response(kwargs)
+                return render(await call(**kwargs), sub_response)
+
+        else:
+
+            @functools.wraps(call)
+            def trusted_call(**kwargs: Any) -> Any:
+                sub_response = take_sub_response(kwargs)
+                return render(call(**kwargs), sub_response)
+
+        dependant.call = trusted_call
+        dependant.response_param_name = param
+        self.app = request_response(self.get_route_handler())
+
@@ -0,0 +1,155 @@
+"""Minimal local SMTP server standing in for a real relay in tests and development.
+
+    python -m app.core.smtp_stub --port 1025
+
+Point the app at it with SMTP_HOST=127.0.0.1 SMTP_PORT=1025 SMTP_STARTTLS=false.
+It understands just enough SMTP for ``smtplib`` (no TLS, any AUTH accepted)
+and keeps received messages in memory.
+"""
+from __future__ import annotations
+
+import argparse
+import socket
+import socketserver
+import threading
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    server: "LocalSmtpServer"
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.track(self.connection)
+
+    def finish(self) -> None:
+        self.server.untrack(self.connection)
+        super().finish()
+
+    def handle(self) -> None:
+        try:
+            self._converse()
+        except OSError:
+            pass  # client or drop_connections() hung up
+
+    def _converse(self) -> None:
+        self.server.connections += 1
+        self._reply("220 localhost SpaceBattle SMTP stand-in")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in {"EHLO", "HELO"}:
+                self._reply("250-localhost")
+                self._reply("250-AUTH PLAIN LOGIN")
+                self._reply("250 8BITMIME")
+            elif verb == "AUTH":
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb in {"MAIL", "RCPT", "RSET", "NOOP"}:
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                self._read_data()
+                self._reply("250 OK queued")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+    def _read_data(self) -> None:
+        lines: list[bytes] = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in {b".\r\n", b".\n"}:
+                break
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        self.server.record(message_from_bytes(b"".join(lines), policy=policy.default))
+
+
+class LocalSmtpServer(socketserver.ThreadingTCPServer):
+    """Threaded SMTP sink; use as a context manager or call ``start()``/``stop()``."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__((host, port), _SmtpHandler)
+        self._lock = threading.Lock()
+        self._messages: list[EmailMessage] = []
+        self._thread: threading.Thread | None = None
+        self._open: set[socket.socket] = set()
+        self.connections = 0
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    @property
+    def messages(self) -> list[EmailMessage]:
+        with self._lock:
+            return list(self._messages)
+
+    def record(self, msg: EmailMessage) -> None:
+        with self._lock:
+            self._messages.append(msg)
+
+    def track(self, sock: socket.socket) -> None:
+        with self._lock:
+            self._open.add(sock)
+
+    def untrack(self, sock: socket.socket) -> None:
+        with self._lock:
+            self._open.discard(sock)
+
+    def drop_connections(self) -> None:
+        """Hang up on every connected client, like a relay timing out idle sessions."""
+        with self._lock:
+            sockets = list(self._open)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def start(self) -> "LocalSmtpServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="smtp-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.drop_connections()
+        self.server_close()
+
+    def __enter__(self) -> "LocalSmtpServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+
+    server = LocalSmtpServer(args.host, args.port)
+    print(f"SMTP stand-in listening on {args.host}:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
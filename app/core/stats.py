@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Mapping
+
+StatsProvider = Callable[[], Mapping[str, Any]]
+
+_providers: dict[str, StatsProvider] = {}
+
+
+def register_stats_provider(name: str, provider: StatsProvider) -> None:
+    """Register a callable whose snapshot is published under ``name``."""
+    _providers[name] = provider
+
+
+def collect_stats() -> dict[str, Any]:
+    """Return a snapshot of every registered provider, keyed by name."""
+    return {name: dict(provider()) for name, provider in _providers.items()}
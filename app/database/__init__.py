@@ -2,27 +2,73 @@
 
 from app.databaseConnector import (
     DatabaseConfigurationError,
+    DatabaseUnavailableError,
+    get_async_connector,
     get_connector,
+    init_async_connector,
     init_connector,
+    pool_stats,
+    shutdown_async_connector,
     shutdown_connector,
+    warm_up_connector,
 )
 
 from .core import (
+    Seek,
+    build_copy,
     build_delete,
     build_insert,
+    build_insert_many,
     build_select,
     build_update,
+    clear_sql_cache,
+    set_async_db,
+    set_db,
+    sql_cache_stats,
+    async_db,
     db,
 )
+from .backends import (
+    StorageBackend,
+    get_async_backend,
+    get_backend,
+    open_backend,
+    set_backend,
+    shutdown_backend,
+)
+from .instrumentation import QueryRecord, request_queries, shutdown_query_explainer
 
 __all__ = [
+    "QueryRecord",
+    "Seek",
+    "StorageBackend",
     "DatabaseConfigurationError",
+    "DatabaseUnavailableError",
+    "get_async_connector",
     "get_connector",
+    "init_async_connector",
     "init_connector",
+    "pool_stats",
+    "shutdown_async_connector",
     "shutdown_connector",
+    "warm_up_connector",
+    "build_copy",
     "build_delete",
     "build_insert",
+    "build_insert_many",
     "build_select",
     "build_update",
+    "clear_sql_cache",
+    "set_async_db",
+    "set_db",
+    "sql_cache_stats",
+    "async_db",
     "db",
+    "get_async_backend",
+    "get_backend",
+    "open_backend",
+    "set_backend",
+    "shutdown_backend",
+    "request_queries",
+    "shutdown_query_explainer",
 ]
@@ -0,0 +1,104 @@
+"""Storage backends behind the repositories, selected with ``DATABASE_BACKEND``.
+
+``postgres`` (default) runs on the psycopg pool, ``memory`` keeps tables in
+process memory and ``sqlite`` uses ``DATABASE_SQLITE_PATH`` (``:memory:`` by
+default). The latter two need no database server, e.g. for development,
+benchmarks and tests.
+"""
+from __future__ import annotations
+
+import os
+from threading import Lock
+
+from app.databaseConnector import DatabaseConfigurationError
+
+from .base import UPSERT_FLAG, AsyncBackendAdapter, AsyncStorageBackend, StorageBackend
+from .memory import MemoryBackend
+from .postgres import AsyncPostgresBackend, PostgresBackend
+from .sqlite import SqliteBackend
+
+DATABASE_BACKEND_ENV = "DATABASE_BACKEND"
+SQLITE_PATH_ENV = "DATABASE_SQLITE_PATH"
+DEFAULT_DATABASE_BACKEND = "postgres"
+
+DATABASE_BACKEND = (os.getenv(DATABASE_BACKEND_ENV) or DEFAULT_DATABASE_BACKEND).strip().lower()
+SQLITE_PATH = os.getenv(SQLITE_PATH_ENV) or ":memory:"
+
+_backend: StorageBackend | None = None
+_async_backend: AsyncStorageBackend | None = None
+_backend_lock = Lock()
+
+
+def create_backend(name: str = DATABASE_BACKEND) -> StorageBackend:
+    if name == "postgres":
+        return PostgresBackend()
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SqliteBackend(SQLITE_PATH)
+    raise DatabaseConfigurationError(
+        f"Invalid value for {DATABASE_BACKEND_ENV}: expected 'postgres', 'memory' or 'sqlite', got {name!r}."
+    )
+
+
+def get_backend() -> StorageBackend:
+    """Return the configured backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+
+def get_async_backend() -> AsyncStorageBackend:
+    global _async_backend
+    if _async_backend is None:
+        backend = get_backend()
+        _async_backend = AsyncPostgresBackend() if isinstance(backend, PostgresBackend) else AsyncBackendAdapter(backend)
+    return _async_backend
+
+
+def set_backend(instance: StorageBackend | None) -> StorageBackend | None:
+    """Replace the active backend; returns the previous one for restoring.
+
+    ``None`` (also what is returned when no backend existed yet) makes the next
+    :func:`get_backend` call create the configured one again.
+    """
+    global _backend, _async_backend
+    with _backend_lock:
+        previous, _backend, _async_backend = _backend, instance, None
+    return previous
+
+
+def open_backend() -> StorageBackend:
+    """Open the active backend eagerly; meant for application startup."""
+    backend = get_backend()
+    backend.open()
+    return backend
+
+
+def shutdown_backend() -> None:
+    global _backend, _async_backend
+    with _backend_lock:
+        backend, _backend, _async_backend = _backend, None, None
+    if backend is not None:
+        backend.close()
+
+
+__all__ = [
+    "UPSERT_FLAG",
+    "AsyncBackendAdapter",
+    "AsyncPostgresBackend",
+    "AsyncStorageBackend",
+    "MemoryBackend",
+    "PostgresBackend",
+    "SqliteBackend",
+    "StorageBackend",
+    "create_backend",
+    "get_async_backend",
+    "get_backend",
+    "open_backend",
+    "set_backend",
+    "shutdown_backend",
+]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Literal, Sequence
+
+import anyio.to_thread
+from psycopg import errors
+
+from app.database.core import STREAM_BATCH_SIZE, Seek
+
+# Rows returned by an upserting ``insert_many`` carry this flag: True when the
+# row was inserted, False when an existing row was updated.
+UPSERT_FLAG = "_inserted"
+
+OnConflict = Literal["nothing", "update"]
+
+
+def unique_violation(table: str, column: str) -> errors.UniqueViolation:
+    """Build the error Postgres would raise, so callers handle every backend alike."""
+    return errors.UniqueViolation(f'duplicate key value violates unique constraint "{table}_{column}_key"')
+
+
+class StorageBackend:
+    """Table-level operations the repositories run against.
+
+    ``where`` maps columns to values and is always an equality conjunction;
+    ``order_by`` is a sanitised ``"column ASC|DESC"`` list as produced by the
+    route helpers. Rows are plain dicts. Unique-key conflicts raise
+    :class:`psycopg.errors.UniqueViolation` regardless of the backend.
+    """
+
+    name: str = ""
+    # Whether calls do blocking I/O and should leave the event loop.
+    blocking: bool = True
+
+    def open(self) -> None:
+        """Prepare the backend eagerly (startup); it opens lazily otherwise."""
+
+    def close(self) -> None:
+        pass
+
+    def ping(self) -> None:
+        """Raise if the backend cannot serve queries."""
+
+    def table_names(self) -> list[str]:
+        raise NotImplementedError
+
+    def select(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        seek: Seek | None = None,
+    ) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    def stream(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        seek: Seek | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[dict[str, Any]]]:
+        raise NotImplementedError
+
+    def select_one(self, table: str, where: dict[str, Any]) -> dict[str, Any] | None:
+        rows = self.select(table, where=where, limit=1)
+        return rows[0] if rows else None
+
+    def insert(self, table: str, data: dict[str, Any], returning: str | None = None) -> dict[str, Any] | None:
+        """Insert one row; returns the ``returning`` columns (``"*"`` for all) or None."""
+        raise NotImplementedError
+
+    def insert_many(
+        self,
+        table: str,
+        rows: Sequence[dict[str, Any]],
+        *,
+        conflict_key: str | None = None,
+        on_conflict: OnConflict | None = None,
+    ) -> list[dict[str, Any]]:
+        """Insert rows sharing one column set and return the written rows.
+
+        ``on_conflict="nothing"`` skips rows whose ``conflict_key`` exists (they
+        are missing from the result); ``"update"`` overwrites them and marks
+        each returned row with :data:`UPSERT_FLAG`.
+        """
+        raise NotImplementedError
+
+    def update(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> int:
+        raise NotImplementedError
+
+    def update_returning(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    def delete(self, table: str, where: dict[str, Any]) -> int:
+        raise NotImplementedError
+
+    def copy(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """Bulk-load rows all-or-nothing; returns the number of rows written."""
+        raise NotImplementedError
+
+
+class AsyncStorageBackend:
+    """Async counterpart of :class:`StorageBackend` for :class:`AsyncRepository`."""
+
+    async def select(self, table: str, **kwargs: Any) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    def stream(self, table: str, **kwargs: Any) -> AsyncIterator[list[dict[str, Any]]]:
+        raise NotImplementedError
+
+    async def select_one(self, table: str, where: dict[str, Any]) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    async def insert(self, table: str, data: dict[str, Any], returning: str | None = None) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    async def update(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> int:
+        raise NotImplementedError
+
+    async def update_returning(
+        self, table: str, data: dict[str, Any], where: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    async def delete(self, table: str, where: dict[str, Any]) -> int:
+        raise NotImplementedError
+
+
+class AsyncBackendAdapter(AsyncStorageBackend):
+    """Expose a sync backend to async code, on a worker thread when it blocks."""
+
+    def __init__(self, backend: StorageBackend) -> None:
+        self.backend = backend
+
+    async def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if not self.backend.blocking:
+            return func(*args, **kwargs)
+        return await anyio.to_thread.run_sync(partial(func, *args, **kwargs))
+
+    async def select(self, table: str, **kwargs: Any) -> list[dict[str, Any]]:
+        return await self._call(self.backend.select, table, **kwargs)
+
+    async def stream(self, table: str, **kwargs: Any) -> AsyncIterator[list[dict[str, Any]]]:
+        batches = await self._call(lambda: list(self.backend.stream(table, **kwargs)))
+        for batch in batches:
+            yield batch
+
+    async def select_one(self, table: str, where: dict[str, Any]) -> dict[str, Any] | None:
+        return await self._call(self.backend.select_one, table, where)
+
+    async def insert(self, table: str, data: dict[str, Any], returning: str | None = None) -> dict[str, Any] | None:
+        return await self._call(self.backend.insert, table, data, returning)
+
+    async def update(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> int:
+        return await self._call(self.backend.update, table, data, where)
+
+    async def update_returning(
+        self, table: str, data: dict[str, Any], where: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        return await self._call(self.backend.update_returning, table, data, where)
+
+    async def delete(self, table: str, where: dict[str, Any]) -> int:
+        return await self._call(self.backend.delete, table, where)
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from itertools import islice
+from threading import RLock
+from typing import Any, Iterable, Iterator, Sequence
+
+from app.database.core import STREAM_BATCH_SIZE, Seek
+
+from .base import UPSERT_FLAG, OnConflict, StorageBackend, unique_violation
+from .schema import TABLES, Table
+
+
+def _parse_order_by(order_by: str | None) -> list[tuple[str, bool]]:
+    """``"name DESC, id DESC"`` -> ``[("name", True), ("id", True)]``."""
+    keys: list[tuple[str, bool]] = []
+    for part in (order_by or "").split(","):
+        column, _, direction = part.strip().partition(" ")
+        if column:
+            keys.append((column, direction.strip().upper() == "DESC"))
+    return keys
+
+
+def _project(row: dict[str, Any], returning: str) -> dict[str, Any]:
+    if returning.strip() == "*":
+        return dict(row)
+    return {column: row[column] for column in (c.strip() for c in returning.split(","))}
+
+
+class _MemoryTable:
+    """Rows keyed by id plus one value -> id hash index per unique column."""
+
+    def __init__(self, schema: Table) -> None:
+        self.schema = schema
+        self.rows: dict[int, dict[str, Any]] = {}
+        self.indexes: dict[str, dict[Any, int]] = {column: {} for column in schema.unique_columns}
+        self.next_id = 1
+        # Ids only ever grew, so ``rows`` iterates in ``id ASC`` order.
+        self.id_ordered = True
+
+    def find(self, where: dict[str, Any] | None) -> Iterable[dict[str, Any]]:
+        if not where:
+            return self.rows.values()
+        if "id" in where:
+            row = self.rows.get(where["id"])
+            candidates = [row] if row is not None else []
+        else:
+            for column, index in self.indexes.items():
+                if column in where:
+                    row_id = index.get(where[column])
+                    candidates = [self.rows[row_id]] if row_id is not None else []
+                    break
+            else:
+                candidates = self.rows.values()
+        return [row for row in candidates if all(row.get(k) == v for k, v in where.items())]
+
+    def check_unique(self, row: dict[str, Any], row_id: int | None = None) -> None:
+        for column, index in self.indexes.items():
+            owner = index.get(row.get(column))
+            if owner is not None and owner != row_id:
+                raise unique_violation(self.schema.name, column)
+
+    def add(self, data: dict[str, Any]) -> dict[str, Any]:
+        row = self.schema.with_defaults(data)
+        row_id = row.get("id")
+        if row_id is None:
+            row_id = row["id"] = self.next_id
+        elif row_id in self.rows:
+            raise unique_violation(self.schema.name, "id")
+        self.check_unique(row)
+        if row_id < self.next_id:
+            self.id_ordered = False
+        self.next_id = max(self.next_id, row_id + 1)
+        self.rows[row_id] = row
+        for column, index in self.indexes.items():
+            index[row[column]] = row_id
+        return row
+
+    def change(self, row: dict[str, Any], data: dict[str, Any]) -> None:
+        if "id" in data and data["id"] != row["id"]:
+            raise ValueError("The memory backend cannot change primary keys")
+        self.check_unique({**row, **data}, row["id"])
+        for column, index in self.indexes.items():
+            if column in data:
+                index.pop(row[column], None)
+                index[data[column]] = row["id"]
+        row.update(data)
+
+    def remove(self, row: dict[str, Any]) -> None:
+        del self.rows[row["id"]]
+        for column, index in self.indexes.items():
+            index.pop(row[column], None)
+
+
+class MemoryBackend(StorageBackend):
+    """Process-local tables for development, benchmarks and tests.
+
+    Lookups by ``id`` and by unique columns (``email``) are hash-index hits;
+    everything else scans. Data lives per process, so each worker has its own.
+    """
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self) -> None:
+        self._tables = {name: _MemoryTable(schema) for name, schema in TABLES.items()}
+        self._lock = RLock()
+
+    def _table(self, name: str) -> _MemoryTable:
+        table = self._tables.get(name)
+        if table is None:
+            raise ValueError(f"Unknown table {name!r}")
+        return table
+
+    def load(self, table: str, rows: Iterable[dict[str, Any]]) -> int:
+        """Seed ``table``; rows keep their ids when they have one."""
+        with self._lock:
+            target = self._table(table)
+            count = 0
+            for row in rows:
+                target.add(row)
+                count += 1
+            return count
+
+    def table_names(self) -> list[str]:
+        return sorted(self._tables)
+
+    def select(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        seek: Seek | None = None,
+    ) -> list[dict[str, Any]]:
+        if seek is not None:
+            order_by = seek.order_by
+        keys = _parse_order_by(order_by)
+        start = offset or 0
+        stop = None if limit is None else start + limit
+        with self._lock:
+            target = self._table(table)
+            rows: Iterable[dict[str, Any]] = target.find(where)
+            if seek is not None and seek.after is not None:
+                value, last_id = seek.after
+                if seek.column == "id":
+                    after = (lambda row: row["id"] < last_id) if seek.descending else (lambda row: row["id"] > last_id)
+                elif seek.descending:
+                    after = lambda row: (row[seek.column], row["id"]) < (value, last_id)  # noqa: E731
+                else:
+                    after = lambda row: (row[seek.column], row["id"]) > (value, last_id)  # noqa: E731
+                rows = filter(after, rows)
+            if keys and not (keys == [("id", False)] and target.id_ordered):
+                rows = list(rows)
+                for column, descending in reversed(keys):
+                    rows.sort(key=lambda row: row[column], reverse=descending)
+            return [dict(row) for row in islice(rows, start, stop)]
+
+    def stream(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        seek: Seek | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[dict[str, Any]]]:
+        rows = self.select(table, where=where, order_by=order_by, limit=limit, seek=seek)
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+    def select_one(self, table: str, where: dict[str, Any]) -> dict[str, Any] | None:
+        with self._lock:
+            for row in self._table(table).find(where):
+                return dict(row)
+        return None
+
+    def insert(self, table: str, data: dict[str, Any], returning: str | None = None) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._table(table).add(data)
+            return _project(row, returning) if returning else None
+
+    def insert_many(
+        self,
+        table: str,
+        rows: Sequence[dict[str, Any]],
+        *,
+        conflict_key: str | None = None,
+        on_conflict: OnConflict | None = None,
+    ) -> list[dict[str, Any]]:
+        written: list[dict[str, Any]] = []
+        with self._lock:
+            target = self._table(table)
+            added: list[dict[str, Any]] = []
+            changed: list[tuple[dict[str, Any], dict[str, Any]]] = []
+            try:
+                for data in rows:
+                    existing = None
+                    if conflict_key is not None and on_conflict is not None:
+                        existing = next(iter(target.find({conflict_key: data[conflict_key]})), None)
+                    if existing is None:
+                        row = target.add(data)
+                        added.append(row)
+                        inserted = True
+                    elif on_conflict == "update":
+                        changed.append((existing, dict(existing)))
+                        target.change(existing, {k: v for k, v in data.items() if k != conflict_key})
+                        row, inserted = existing, False
+                    else:
+                        continue
+                    written.append({**row, UPSERT_FLAG: inserted} if on_conflict == "update" else dict(row))
+            except Exception:
+                # One statement in Postgres: a failure leaves the table untouched.
+                for row in added:
+                    target.remove(row)
+                for row, before in reversed(changed):
+                    target.change(row, before)
+                raise
+        return written
+
+    def update(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> int:
+        with self._lock:
+            target = self._table(table)
+            rows = list(target.find(where))
+            for row in rows:
+                target.change(row, data)
+            return len(rows)
+
+    def update_returning(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> dict[str, Any] | None:
+        with self._lock:
+            target = self._table(table)
+            row = next(iter(target.find(where)), None)
+            if row is None:
+                return None
+            target.change(row, data)
+            return dict(row)
+
+    def delete(self, table: str, where: dict[str, Any]) -> int:
+        with self._lock:
+            target = self._table(table)
+            rows = list(target.find(where))
+            for row in rows:
+                target.remove(row)
+            return len(rows)
+
+    def copy(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        return len(self.insert_many(table, [dict(zip(columns, values)) for values in rows]))
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Iterable, Iterator, Sequence
+
+from app.database import core as db_core
+from app.database.core import (
+    STREAM_BATCH_SIZE,
+    Seek,
+    build_copy,
+    build_delete,
+    build_insert,
+    build_insert_many,
+    build_select,
+    build_update,
+)
+from app.databaseConnector import get_connector, warm_up_connector
+
+from .base import UPSERT_FLAG, AsyncStorageBackend, OnConflict, StorageBackend
+
+# Postgres reports xmax = 0 for freshly inserted tuples, non-zero for ON CONFLICT updates.
+_UPSERT_RETURNING = f"*, (xmax = 0) AS {UPSERT_FLAG}"
+
+
+class PostgresBackend(StorageBackend):
+    """Runs the ``build_*`` statements through :data:`app.database.core.db`.
+
+    ``db`` is looked up on every call, so :func:`set_db` stand-ins apply here too.
+    """
+
+    name = "postgres"
+
+    def open(self) -> None:
+        warm_up_connector()
+
+    def ping(self) -> None:
+        get_connector().ping()
+
+    def table_names(self) -> list[str]:
+        return list(get_connector().iter_user_tables())
+
+    def select(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        seek: Seek | None = None,
+    ) -> list[dict[str, Any]]:
+        sql, params = build_select(table, where=where, order_by=order_by, limit=limit, offset=offset, seek=seek)
+        return db_core.db.fetch_all(sql, params, prepare=True)
+
+    def stream(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        seek: Seek | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[dict[str, Any]]]:
+        sql, params = build_select(table, where=where, order_by=order_by, limit=limit, seek=seek)
+        return db_core.db.stream(sql, params, batch_size=batch_size)
+
+    def select_one(self, table: str, where: dict[str, Any]) -> dict[str, Any] | None:
+        sql, params = build_select(table, where=where, limit=1)
+        return db_core.db.fetch_one(sql, params, prepare=True)
+
+    def insert(self, table: str, data: dict[str, Any], returning: str | None = None) -> dict[str, Any] | None:
+        sql, params = build_insert(table, data, returning=returning)
+        if returning:
+            return db_core.db.fetch_one(sql, params, prepare=True)
+        db_core.db.execute(sql, params, prepare=True)
+        return None
+
+    def insert_many(
+        self,
+        table: str,
+        rows: Sequence[dict[str, Any]],
+        *,
+        conflict_key: str | None = None,
+        on_conflict: OnConflict | None = None,
+    ) -> list[dict[str, Any]]:
+        sql, params = build_insert_many(
+            table,
+            rows,
+            conflict_key=conflict_key,
+            on_conflict=on_conflict,
+            returning=_UPSERT_RETURNING if on_conflict == "update" else "*",
+        )
+        return db_core.db.fetch_all(sql, params)
+
+    def update(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> int:
+        sql, params = build_update(table, data, where=where)
+        return db_core.db.execute(sql, params, prepare=True)
+
+    def update_returning(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> dict[str, Any] | None:
+        sql, params = build_update(table, data, where=where, returning="*")
+        return db_core.db.fetch_one(sql, params, prepare=True)
+
+    def delete(self, table: str, where: dict[str, Any]) -> int:
+        sql, params = build_delete(table, where=where)
+        return db_core.db.execute(sql, params, prepare=True)
+
+    def copy(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        return db_core.db.copy_rows(build_copy(table, columns), rows)
+
+
+class AsyncPostgresBackend(AsyncStorageBackend):
+    """Async mirror of :class:`PostgresBackend` on :data:`app.database.core.async_db`."""
+
+    async def select(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        seek: Seek | None = None,
+    ) -> list[dict[str, Any]]:
+        sql, params = build_select(table, where=where, order_by=order_by, limit=limit, offset=offset, seek=seek)
+        return await db_core.async_db.fetch_all(sql, params, prepare=True)
+
+    def stream(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        seek: Seek | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        sql, params = build_select(table, where=where, order_by=order_by, limit=limit, seek=seek)
+        return db_core.async_db.stream(sql, params, batch_size=batch_size)
+
+    async def select_one(self, table: str, where: dict[str, Any]) -> dict[str, Any] | None:
+        sql, params = build_select(table, where=where, limit=1)
+        return await db_core.async_db.fetch_one(sql, params, prepare=True)
+
+    async def insert(self, table: str, data: dict[str, Any], returning: str | None = None) -> dict[str, Any] | None:
+        sql, params = build_insert(table, data, returning=returning)
+        if returning:
+            return await db_core.async_db.fetch_one(sql, params, prepare=True)
+        await db_core.async_db.execute(sql, params, prepare=True)
+        return None
+
+    async def update(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> int:
+        sql, params = build_update(table, data, where=where)
+        return await db_core.async_db.execute(sql, params, prepare=True)
+
+    async def update_returning(
+        self, table: str, data: dict[str, Any], where: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        sql, params = build_update(table, data, where=where, returning="*")
+        return await db_core.async_db.fetch_one(sql, params, prepare=True)
+
+    async def delete(self, table: str, where: dict[str, Any]) -> int:
+        sql, params = build_delete(table, where=where)
+        return await db_core.async_db.execute(sql, params, prepare=True)
@@ -0,0 +1,68 @@
+"""Table definitions for the backends that own their schema (memory, SQLite).
+
+Postgres keeps its schema in the database itself; these definitions mirror it
+closely enough for the repositories: column types, unique keys and the
+defaults the server would fill in on INSERT.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    type: type
+    default: Callable[[], Any] | None = None
+    unique: bool = False
+
+
+@dataclass(frozen=True)
+class Table:
+    """A table keyed by an auto-incrementing integer ``id``."""
+
+    name: str
+    columns: tuple[Column, ...]
+
+    @property
+    def unique_columns(self) -> tuple[str, ...]:
+        return tuple(column.name for column in self.columns if column.unique)
+
+    def with_defaults(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return ``data`` plus defaults for missing columns, in a stable key order."""
+        row = dict(data)
+        for column in self.columns:
+            if column.name not in row and column.default is not None:
+                row[column.name] = column.default()
+        return row
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+TABLES: dict[str, Table] = {
+    "users": Table(
+        "users",
+        (
+            Column("id", int),
+            Column("name", str),
+            Column("email", str, unique=True),
+            Column("verified", bool, default=lambda: False),
+            Column("blocked", bool, default=lambda: False),
+            Column("role", str, default=lambda: "player"),
+            Column("language", str, default=lambda: "de"),
+            Column("created_at", datetime, default=_utcnow),
+            Column("password_hash", str),
+        ),
+    ),
+}
+
+
+def get_table(name: str) -> Table:
+    try:
+        return TABLES[name]
+    except KeyError:
+        raise ValueError(f"Unknown table {name!r}") from None
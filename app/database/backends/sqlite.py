@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from datetime import datetime
+from enum import Enum
+from threading import RLock
+from time import perf_counter
+from typing import Any, Iterable, Iterator, Sequence
+
+from app.database.core import (
+    STREAM_BATCH_SIZE,
+    Seek,
+    build_delete,
+    build_insert,
+    build_insert_many,
+    build_select,
+    build_update,
+)
+from app.database.instrumentation import record_query
+from app.databaseConnector import DatabaseUnavailableError
+
+from .base import UPSERT_FLAG, OnConflict, StorageBackend, unique_violation
+from .schema import TABLES, Table, get_table
+
+_SQLITE_TYPES = {int: "INTEGER", bool: "INTEGER", str: "TEXT", datetime: "TEXT"}
+
+
+def _create_table_sql(table: Table) -> str:
+    columns = []
+    for column in table.columns:
+        if column.name == "id":
+            columns.append("id INTEGER PRIMARY KEY AUTOINCREMENT")
+            continue
+        definition = f"{column.name} {_SQLITE_TYPES[column.type]} NOT NULL"
+        if column.unique:
+            definition += " UNIQUE"
+        columns.append(definition)
+    return f"CREATE TABLE IF NOT EXISTS {table.name} ({', '.join(columns)})"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class SqliteBackend(StorageBackend):
+    """SQLite file (or ``:memory:``) database created from :mod:`.schema`.
+
+    Statements come from the same ``build_*`` helpers as on Postgres, with
+    ``%s`` placeholders rewritten to ``?``. One connection is shared behind a
+    lock, which suits development and tests rather than concurrent load.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if self.path != ":memory:" and directory:
+                os.makedirs(directory, exist_ok=True)
+            # isolation_level=None: autocommit, like the Postgres pool.
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            for table in TABLES.values():
+                conn.execute(_create_table_sql(table))
+            self._conn = conn
+        return self._conn
+
+    def open(self) -> None:
+        with self._lock:
+            self._connection()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def ping(self) -> None:
+        try:
+            with self._lock:
+                self._connection().execute("SELECT 1")
+        except sqlite3.Error as exc:
+            raise DatabaseUnavailableError(f"SQLite database {self.path!r} is not usable") from exc
+
+    def table_names(self) -> list[str]:
+        rows = self._fetch(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )
+        return [row["name"] for row in rows]
+
+    def _execute(
+        self, sql: str, params: Sequence[Any] = (), table: str | None = None
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Run one statement; returns its rows (decoded for ``table``) and the affected row count."""
+        started = perf_counter()
+        with self._lock:
+            conn = self._connection()
+            acquired = perf_counter()
+            try:
+                cursor = conn.execute(sql.replace("%s", "?"), [_encode(value) for value in params])
+            except sqlite3.IntegrityError as exc:
+                raise self._translate(exc, table) from exc
+            rows = cursor.fetchall()
+            count = len(rows) if cursor.description else cursor.rowcount
+        record_query(sql, params, started, acquired, perf_counter(), count, explain=False)
+        return (self._decode(table, rows) if table else [dict(row) for row in rows]), count
+
+    def _fetch(self, sql: str, params: Sequence[Any] = (), table: str | None = None) -> list[dict[str, Any]]:
+        return self._execute(sql, params, table)[0]
+
+    @staticmethod
+    def _translate(exc: sqlite3.IntegrityError, table: str | None) -> Exception:
+        # "UNIQUE constraint failed: users.email"
+        message = str(exc)
+        if not message.startswith("UNIQUE constraint failed: "):
+            return exc
+        qualified = message.removeprefix("UNIQUE constraint failed: ").split(",")[0].strip()
+        table_name, _, column = qualified.partition(".")
+        return unique_violation(table or table_name, column)
+
+    @staticmethod
+    def _decode(table: str, rows: list[sqlite3.Row]) -> list[dict[str, Any]]:
+        types = {column.name: column.type for column in get_table(table).columns}
+        decoded = []
+        for row in rows:
+            item = dict(row)
+            for key, value in item.items():
+                kind = types.get(key)
+                if value is None or kind is None:
+                    continue
+                if kind is bool:
+                    item[key] = bool(value)
+                elif kind is datetime:
+                    item[key] = datetime.fromisoformat(value)
+            decoded.append(item)
+        return decoded
+
+    def select(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        seek: Seek | None = None,
+    ) -> list[dict[str, Any]]:
+        if offset is not None and limit is None:
+            limit = -1  # SQLite only accepts OFFSET after a LIMIT; negative means unbounded.
+        sql, params = build_select(table, where=where, order_by=order_by, limit=limit, offset=offset, seek=seek)
+        return self._fetch(sql, params, table)
+
+    def stream(
+        self,
+        table: str,
+        *,
+        where: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        seek: Seek | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[dict[str, Any]]]:
+        # Read up front: holding the shared connection across yields would block every other caller.
+        rows = self.select(table, where=where, order_by=order_by, limit=limit, seek=seek)
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+    def insert(self, table: str, data: dict[str, Any], returning: str | None = None) -> dict[str, Any] | None:
+        sql, params = build_insert(table, get_table(table).with_defaults(data), returning=returning)
+        rows = self._fetch(sql, params, table)
+        return rows[0] if returning and rows else None
+
+    def insert_many(
+        self,
+        table: str,
+        rows: Sequence[dict[str, Any]],
+        *,
+        conflict_key: str | None = None,
+        on_conflict: OnConflict | None = None,
+    ) -> list[dict[str, Any]]:
+        schema = get_table(table)
+        sql, params = build_insert_many(
+            table,
+            [schema.with_defaults(row) for row in rows],
+            conflict_key=conflict_key,
+            on_conflict=on_conflict,
+            returning="*",
+        )
+        if on_conflict != "update":
+            return self._fetch(sql, params, table)
+
+        keys = [row[conflict_key] for row in rows]
+        with self._lock:
+            # There is no xmax here; rows whose key existed beforehand were updated.
+            existing_sql = f"SELECT {conflict_key} FROM {table} WHERE {conflict_key} IN ({', '.join(['%s'] * len(keys))})"
+            existing = {row[conflict_key] for row in self._fetch(existing_sql, keys)}
+            written = self._fetch(sql, params, table)
+        for row in written:
+            row[UPSERT_FLAG] = row[conflict_key] not in existing
+        return written
+
+    def update(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> int:
+        sql, params = build_update(table, data, where=where)
+        return self._execute(sql, params, table)[1]
+
+    def update_returning(self, table: str, data: dict[str, Any], where: dict[str, Any]) -> dict[str, Any] | None:
+        sql, params = build_update(table, data, where=where, returning="*")
+        rows = self._fetch(sql, params, table)
+        return rows[0] if rows else None
+
+    def delete(self, table: str, where: dict[str, Any]) -> int:
+        sql, params = build_delete(table, where=where)
+        return self._execute(sql, params, table)[1]
+
+    def copy(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        schema = get_table(table)
+        prepared = [schema.with_defaults(dict(zip(columns, values))) for values in rows]
+        if not prepared:
+            return 0
+        sql, _ = build_insert(table, prepared[0])
+        started = perf_counter()
+        with self._lock:
+            conn = self._connection()
+            acquired = perf_counter()
+            try:
+                conn.execute("BEGIN")
+                conn.executemany(sql.replace("%s", "?"), [[_encode(v) for v in row.values()] for row in prepared])
+                conn.execute("COMMIT")
+            except sqlite3.IntegrityError as exc:
+                conn.execute("ROLLBACK")
+                raise self._translate(exc, table) from exc
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        record_query(sql, None, started, acquired, perf_counter(), len(prepared), explain=False)
+        return len(prepared)
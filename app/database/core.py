@@ -1,12 +1,28 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
-from typing import Any, Iterable, Iterator
+import os
+import uuid
+from time import perf_counter
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterable, Iterator, Literal, Sequence
 
 import psycopg
 from psycopg.rows import dict_row
 
-from app.databaseConnector import get_connector
+from app.core.stats import register_stats_provider
+from app.databaseConnector import get_async_connector, get_connector
+
+from .instrumentation import record_query
+
+SQL_CACHE_SIZE_ENV = "DATABASE_SQL_CACHE_SIZE"
+STREAM_BATCH_SIZE_ENV = "DATABASE_STREAM_BATCH_SIZE"
+DEFAULT_SQL_CACHE_SIZE = 512
+DEFAULT_STREAM_BATCH_SIZE = 1000
+
+_SQL_CACHE_SIZE = int(os.getenv(SQL_CACHE_SIZE_ENV) or DEFAULT_SQL_CACHE_SIZE)
+STREAM_BATCH_SIZE = int(os.getenv(STREAM_BATCH_SIZE_ENV) or DEFAULT_STREAM_BATCH_SIZE)
 
 
 class Db:
@@ -24,53 +40,373 @@ class Db:
             with conn.transaction():
                 yield conn
 
-    def fetch_all(self, sql: str, params: Iterable[Any] | None = None) -> list[dict]:
+    # ``prepare`` is forwarded to psycopg: True prepares server-side right away,
+    # None defers to the connection's prepare_threshold, False never prepares.
+
+    # Each statement is timed from pool checkout to result and handed to
+    # ``record_query`` (request attribution, slow log, N+1 warnings).
+
+    def fetch_all(self, sql: str, params: Iterable[Any] | None = None, *, prepare: bool | None = None) -> list[dict]:
+        started = perf_counter()
         with self._conn() as conn, conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(sql, params or [])
-            return list(cur.fetchall())
+            acquired = perf_counter()
+            cur.execute(sql, params or [], prepare=prepare)
+            rows = list(cur.fetchall())
+        record_query(sql, params, started, acquired, perf_counter(), len(rows))
+        return rows
 
-    def fetch_one(self, sql: str, params: Iterable[Any] | None = None) -> dict | None:
+    def fetch_one(self, sql: str, params: Iterable[Any] | None = None, *, prepare: bool | None = None) -> dict | None:
+        started = perf_counter()
         with self._conn() as conn, conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(sql, params or [])
-            return cur.fetchone()
+            acquired = perf_counter()
+            cur.execute(sql, params or [], prepare=prepare)
+            row = cur.fetchone()
+        record_query(sql, params, started, acquired, perf_counter(), 0 if row is None else 1)
+        return row
 
-    def execute(self, sql: str, params: Iterable[Any] | None = None) -> int:
+    def execute(self, sql: str, params: Iterable[Any] | None = None, *, prepare: bool | None = None) -> int:
+        started = perf_counter()
         with self._conn() as conn, conn.cursor() as cur:
-            cur.execute(sql, params or [])
-            return cur.rowcount
+            acquired = perf_counter()
+            cur.execute(sql, params or [], prepare=prepare)
+            count = cur.rowcount
+        record_query(sql, params, started, acquired, perf_counter(), count)
+        return count
+
+    def stream(
+        self,
+        sql: str,
+        params: Iterable[Any] | None = None,
+        *,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[dict]]:
+        """Yield result rows in ``batch_size`` lists from a named server-side cursor.
+
+        Only one batch is held in memory; the pooled connection stays checked out
+        until the generator is exhausted or closed.
+        """
+        with self._conn() as conn, conn.transaction():
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}", row_factory=dict_row) as cur:
+                cur.itersize = batch_size
+                cur.execute(sql, params or [])
+                while rows := cur.fetchmany(batch_size):
+                    yield rows
 
     def executemany(self, sql: str, seq_params: Iterable[Iterable[Any]]) -> int:
+        started = perf_counter()
         with self._conn() as conn, conn.cursor() as cur:
+            acquired = perf_counter()
             cur.executemany(sql, seq_params)
-            return cur.rowcount
+            count = cur.rowcount
+        record_query(sql, None, started, acquired, perf_counter(), count)
+        return count
+
+    def copy_rows(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """Stream ``rows`` through a ``COPY ... FROM STDIN`` statement in one transaction."""
+        count = 0
+        started = perf_counter()
+        with self._conn() as conn, conn.transaction(), conn.cursor() as cur:
+            acquired = perf_counter()
+            with cur.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+                    count += 1
+        record_query(sql, None, started, acquired, perf_counter(), count)
+        return count
 
 
 db = Db()
 
 
-def build_insert(table: str, data: dict[str, Any], returning: str | None = None) -> tuple[str, list[Any]]:
-    cols = list(data.keys())
-    vals = list(data.values())
+class AsyncDb:
+    """Async mirror of :class:`Db` for use from ``async def`` routes."""
+
+    @asynccontextmanager
+    async def _conn(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        async with get_async_connector().connection() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        """Provide an explicit transaction while autocommit is on in the pool."""
+        async with self._conn() as conn:
+            async with conn.transaction():
+                yield conn
+
+    async def fetch_all(
+        self, sql: str, params: Iterable[Any] | None = None, *, prepare: bool | None = None
+    ) -> list[dict]:
+        started = perf_counter()
+        async with self._conn() as conn, conn.cursor(row_factory=dict_row) as cur:
+            acquired = perf_counter()
+            await cur.execute(sql, params or [], prepare=prepare)
+            rows = list(await cur.fetchall())
+        record_query(sql, params, started, acquired, perf_counter(), len(rows))
+        return rows
+
+    async def fetch_one(
+        self, sql: str, params: Iterable[Any] | None = None, *, prepare: bool | None = None
+    ) -> dict | None:
+        started = perf_counter()
+        async with self._conn() as conn, conn.cursor(row_factory=dict_row) as cur:
+            acquired = perf_counter()
+            await cur.execute(sql, params or [], prepare=prepare)
+            row = await cur.fetchone()
+        record_query(sql, params, started, acquired, perf_counter(), 0 if row is None else 1)
+        return row
+
+    async def execute(self, sql: str, params: Iterable[Any] | None = None, *, prepare: bool | None = None) -> int:
+        started = perf_counter()
+        async with self._conn() as conn, conn.cursor() as cur:
+            acquired = perf_counter()
+            await cur.execute(sql, params or [], prepare=prepare)
+            count = cur.rowcount
+        record_query(sql, params, started, acquired, perf_counter(), count)
+        return count
+
+    async def stream(
+        self,
+        sql: str,
+        params: Iterable[Any] | None = None,
+        *,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield result rows in ``batch_size`` lists from a named server-side cursor."""
+        async with self._conn() as conn, conn.transaction():
+            async with conn.cursor(name=f"stream_{uuid.uuid4().hex}", row_factory=dict_row) as cur:
+                cur.itersize = batch_size
+                await cur.execute(sql, params or [])
+                while rows := await cur.fetchmany(batch_size):
+                    yield rows
+
+    async def executemany(self, sql: str, seq_params: Iterable[Iterable[Any]]) -> int:
+        started = perf_counter()
+        async with self._conn() as conn, conn.cursor() as cur:
+            acquired = perf_counter()
+            await cur.executemany(sql, seq_params)
+            count = cur.rowcount
+        record_query(sql, None, started, acquired, perf_counter(), count)
+        return count
+
+    async def copy_rows(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """Stream ``rows`` through a ``COPY ... FROM STDIN`` statement in one transaction."""
+        count = 0
+        started = perf_counter()
+        async with self._conn() as conn, conn.transaction(), conn.cursor() as cur:
+            acquired = perf_counter()
+            async with cur.copy(sql) as copy:
+                for row in rows:
+                    await copy.write_row(row)
+                    count += 1
+        record_query(sql, None, started, acquired, perf_counter(), count)
+        return count
+
+
+async_db = AsyncDb()
+
+
+# Repositories resolve ``db``/``async_db`` through this module on every call,
+# so swapping them (in-memory stand-ins for benchmarks) takes effect at once.
+
+
+def set_db(instance: Db) -> Db:
+    """Replace the module-level :data:`db`; returns the previous instance for restoring."""
+    global db
+    previous, db = db, instance
+    return previous
+
+
+def set_async_db(instance: AsyncDb) -> AsyncDb:
+    """Replace the module-level :data:`async_db`; returns the previous instance."""
+    global async_db
+    previous, async_db = async_db, instance
+    return previous
+
+
+@dataclass(frozen=True)
+class Seek:
+    """Keyset pagination spec: order by ``column`` with ``id`` as tiebreaker.
+
+    ``after`` holds the ``(column value, id)`` of the last row of the previous
+    page; the next page is then a plain index range scan regardless of depth.
+    """
+
+    column: str
+    descending: bool = False
+    after: tuple[Any, Any] | None = None
+
+    @property
+    def order_by(self) -> str:
+        direction = "DESC" if self.descending else "ASC"
+        if self.column == "id":
+            return f"id {direction}"
+        return f"{self.column} {direction}, id {direction}"
+
+
+# SQL text only depends on the statement *shape* (table, column names, where
+# keys, order/limit presence), never on values, so it is memoised per shape.
+
+
+@lru_cache(maxsize=_SQL_CACHE_SIZE)
+def _insert_sql(table: str, cols: tuple[str, ...], returning: str | None) -> str:
     placeholders = ", ".join(["%s"] * len(cols))
     sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
     if returning:
         sql += f" RETURNING {returning}"
-    return sql, vals
+    return sql
 
 
-def build_update(table: str, data: dict[str, Any], where: dict[str, Any]) -> tuple[str, list[Any]]:
-    set_clause = ", ".join([f"{k} = %s" for k in data.keys()])
-    where_clause = " AND ".join([f"{k} = %s" for k in where.keys()])
-    params = list(data.values()) + list(where.values())
+@lru_cache(maxsize=_SQL_CACHE_SIZE)
+def _update_sql(
+    table: str,
+    set_cols: tuple[str, ...],
+    where_cols: tuple[str, ...],
+    returning: str | None,
+) -> str:
+    set_clause = ", ".join([f"{k} = %s" for k in set_cols])
+    where_clause = " AND ".join([f"{k} = %s" for k in where_cols])
     sql = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
-    return sql, params
+    if returning:
+        sql += f" RETURNING {returning}"
+    return sql
+
+
+@lru_cache(maxsize=_SQL_CACHE_SIZE)
+def _delete_sql(table: str, where_cols: tuple[str, ...]) -> str:
+    where_clause = " AND ".join([f"{k} = %s" for k in where_cols])
+    return f"DELETE FROM {table} WHERE {where_clause}"
+
+
+@lru_cache(maxsize=_SQL_CACHE_SIZE)
+def _select_sql(
+    table: str,
+    cols: str,
+    where_cols: tuple[str, ...],
+    order_by: str | None,
+    has_limit: bool,
+    has_offset: bool,
+    seek_after: tuple[str, bool] | None = None,
+) -> str:
+    sql = f"SELECT {cols} FROM {table}"
+    conditions = [f"{k} = %s" for k in where_cols]
+    if seek_after is not None:
+        column, descending = seek_after
+        op = "<" if descending else ">"
+        conditions.append(f"id {op} %s" if column == "id" else f"({column}, id) {op} (%s, %s)")
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    if has_limit:
+        sql += " LIMIT %s"
+    if has_offset:
+        sql += " OFFSET %s"
+    return sql
+
+
+@lru_cache(maxsize=_SQL_CACHE_SIZE)
+def _insert_many_sql(
+    table: str,
+    cols: tuple[str, ...],
+    row_count: int,
+    conflict_key: str | None,
+    on_conflict: str | None,
+    returning: str | None,
+) -> str:
+    row = "(" + ", ".join(["%s"] * len(cols)) + ")"
+    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES " + ", ".join([row] * row_count)
+    if conflict_key and on_conflict == "nothing":
+        sql += f" ON CONFLICT ({conflict_key}) DO NOTHING"
+    elif conflict_key and on_conflict == "update":
+        # Always touch at least the key so RETURNING yields the existing row.
+        update_cols = [c for c in cols if c != conflict_key] or [conflict_key]
+        set_clause = ", ".join([f"{c} = EXCLUDED.{c}" for c in update_cols])
+        sql += f" ON CONFLICT ({conflict_key}) DO UPDATE SET {set_clause}"
+    if returning:
+        sql += f" RETURNING {returning}"
+    return sql
+
+
+@lru_cache(maxsize=_SQL_CACHE_SIZE)
+def _copy_sql(table: str, cols: tuple[str, ...]) -> str:
+    return f"COPY {table} ({', '.join(cols)}) FROM STDIN"
+
+
+_SQL_CACHES = {
+    "insert": _insert_sql,
+    "insert_many": _insert_many_sql,
+    "copy": _copy_sql,
+    "update": _update_sql,
+    "delete": _delete_sql,
+    "select": _select_sql,
+}
+
+
+def sql_cache_stats() -> dict[str, dict[str, float | int]]:
+    """Return hit/miss counters and hit rate for each memoised SQL builder."""
+    stats: dict[str, dict[str, float | int]] = {}
+    for name, func in _SQL_CACHES.items():
+        info = func.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize or 0,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        }
+    return stats
+
+
+register_stats_provider("sql_cache", sql_cache_stats)
+
+
+def clear_sql_cache() -> None:
+    """Drop every memoised statement (mainly useful for tests and benchmarks)."""
+    for func in _SQL_CACHES.values():
+        func.cache_clear()
+
+
+def build_insert(table: str, data: dict[str, Any], returning: str | None = None) -> tuple[str, list[Any]]:
+    return _insert_sql(table, tuple(data.keys()), returning), list(data.values())
+
+
+def build_insert_many(
+    table: str,
+    rows: Sequence[dict[str, Any]],
+    *,
+    conflict_key: str | None = None,
+    on_conflict: Literal["nothing", "update"] | None = None,
+    returning: str | None = None,
+) -> tuple[str, list[Any]]:
+    """Build one multi-row ``INSERT ... VALUES`` statement; all rows must share their columns."""
+    if not rows:
+        raise ValueError("Bulk insert needs at least one row")
+    cols = tuple(rows[0].keys())
+    params: list[Any] = []
+    for row in rows:
+        if tuple(row.keys()) != cols:
+            raise ValueError("All rows of a multi-row insert must share the same columns")
+        params.extend(row.values())
+    return _insert_many_sql(table, cols, len(rows), conflict_key, on_conflict, returning), params
+
+
+def build_copy(table: str, columns: Sequence[str]) -> str:
+    return _copy_sql(table, tuple(columns))
+
+
+def build_update(
+    table: str,
+    data: dict[str, Any],
+    where: dict[str, Any],
+    returning: str | None = None,
+) -> tuple[str, list[Any]]:
+    params = list(data.values()) + list(where.values())
+    return _update_sql(table, tuple(data.keys()), tuple(where.keys()), returning), params
 
 
 def build_delete(table: str, where: dict[str, Any]) -> tuple[str, list[Any]]:
-    where_clause = " AND ".join([f"{k} = %s" for k in where.keys()])
-    params = list(where.values())
-    sql = f"DELETE FROM {table} WHERE {where_clause}"
-    return sql, params
+    return _delete_sql(table, tuple(where.keys())), list(where.values())
 
 
 def build_select(
@@ -80,19 +416,31 @@ def build_select(
     order_by: str | None = None,
     limit: int | None = None,
     offset: int | None = None,
+    seek: Seek | None = None,
 ) -> tuple[str, list[Any]]:
+    """Build a SELECT; ``seek`` switches to keyset pagination and overrides ``order_by``."""
     cols = columns if isinstance(columns, str) else ", ".join(columns)
-    sql = f"SELECT {cols} FROM {table}"
     params: list[Any] = []
     if where:
-        sql += " WHERE " + " AND ".join([f"{k} = %s" for k in where.keys()])
         params.extend(where.values())
-    if order_by:
-        sql += f" ORDER BY {order_by}"
+    seek_after: tuple[str, bool] | None = None
+    if seek is not None:
+        order_by = seek.order_by
+        if seek.after is not None:
+            seek_after = (seek.column, seek.descending)
+            value, last_id = seek.after
+            params.extend([last_id] if seek.column == "id" else [value, last_id])
     if limit is not None:
-        sql += " LIMIT %s"
         params.append(limit)
     if offset is not None:
-        sql += " OFFSET %s"
         params.append(offset)
+    sql = _select_sql(
+        table,
+        cols,
+        tuple(where.keys()) if where else (),
+        order_by,
+        limit is not None,
+        offset is not None,
+        seek_after,
+    )
     return sql, params
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Iterable
+
+from app.core.metrics import registry
+from app.core.request_context import current_request
+from app.databaseConnector import get_connector
+
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", "25"))
+REPEATED_QUERY_WARN = int(os.getenv("DB_REPEATED_QUERY_WARN", "5"))
+EXPLAIN_SAMPLE_RATE = float(os.getenv("DB_EXPLAIN_SAMPLE_RATE", "0"))
+QUERY_LOG_LIMIT = 100
+
+logger = logging.getLogger("spacebattle.db.queries")
+
+_EXPLAINABLE = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
+QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds", "Database statement execution time by operation.", ("operation",)
+)
+
+
+@dataclass(frozen=True)
+class QueryRecord:
+    """One executed statement; ``sql`` is the parametrised text, i.e. its shape."""
+
+    sql: str
+    duration_ms: float
+    rows: int
+    pool_wait_ms: float
+
+
+def _shorten(sql: str, limit: int = 500) -> str:
+    sql = " ".join(sql.split())
+    return sql if len(sql) <= limit else sql[:limit] + "..."
+
+
+def request_queries() -> list[QueryRecord]:
+    """Return the statements recorded for the current request (capped at ``QUERY_LOG_LIMIT``)."""
+    ctx = current_request()
+    return list(ctx.queries) if ctx is not None else []
+
+
+def record_query(
+    sql: str,
+    params: Iterable[Any] | None,
+    started: float,
+    acquired: float,
+    finished: float,
+    rows: int,
+    *,
+    explain: bool = True,
+) -> None:
+    """Attach a finished statement to the current request and apply slow/N+1 checks.
+
+    ``started`` is taken before the pool checkout, ``acquired`` once a connection
+    was handed out and ``finished`` after the result was read (all ``perf_counter``).
+    ``explain=False`` skips plan capture for statements that did not run on Postgres.
+    """
+    duration = finished - acquired
+    duration_ms = duration * 1000
+    pool_wait_ms = (acquired - started) * 1000
+    # Label by leading keyword (select, copy, with, ...), not a fixed-width prefix.
+    QUERY_DURATION.observe(duration, sql.lstrip().split(None, 1)[0].lower())
+
+    ctx = current_request()
+    request_id = ctx.request_id if ctx is not None else "-"
+    if ctx is not None:
+        ctx.add_timing("db", duration_ms)
+        if len(ctx.queries) < QUERY_LOG_LIMIT:
+            ctx.queries.append(QueryRecord(sql, duration_ms, rows, pool_wait_ms))
+        ctx.query_count += 1
+        repeats = ctx.query_shapes[sql] = ctx.query_shapes.get(sql, 0) + 1
+        # Warn exactly once per threshold crossing so a runaway loop logs two lines, not thousands.
+        if ctx.query_count == QUERY_BUDGET + 1:
+            logger.warning("Request %s exceeded its query budget of %d statements", request_id, QUERY_BUDGET)
+        if repeats == REPEATED_QUERY_WARN:
+            logger.warning(
+                "Request %s ran the same statement %d times (possible N+1): %s",
+                request_id,
+                repeats,
+                _shorten(sql),
+            )
+
+    if SLOW_QUERY_MS and duration_ms >= SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query in request %s: %.1f ms, %d rows, pool wait %.1f ms: %s",
+            request_id,
+            duration_ms,
+            rows,
+            pool_wait_ms,
+            _shorten(sql),
+        )
+        if explain:
+            _maybe_explain(sql, params, request_id)
+
+
+_explain_executor: ThreadPoolExecutor | None = None
+_explain_lock = Lock()
+_explain_busy = False
+
+
+def _maybe_explain(sql: str, params: Iterable[Any] | None, request_id: str) -> None:
+    """Capture ``EXPLAIN (ANALYZE, BUFFERS)`` for a sampled slow SELECT off the request path.
+
+    ANALYZE executes the statement again, so only plain SELECTs qualify and at
+    most one capture runs at a time; samples arriving meanwhile are dropped.
+    """
+    global _explain_executor, _explain_busy
+    if EXPLAIN_SAMPLE_RATE <= 0 or not _EXPLAINABLE.match(sql) or random.random() >= EXPLAIN_SAMPLE_RATE:
+        return
+    with _explain_lock:
+        if _explain_busy:
+            return
+        _explain_busy = True
+        if _explain_executor is None:
+            _explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-explain")
+    _explain_executor.submit(_explain, sql, list(params or []), request_id)
+
+
+def _explain(sql: str, params: list[Any], request_id: str) -> None:
+    global _explain_busy
+    try:
+        with get_connector().connection() as conn, conn.cursor() as cur:
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, params)
+            plan = "\n".join(row[0] for row in cur.fetchall())
+        logger.warning("Plan for slow query in request %s:\n%s", request_id, plan)
+    except Exception:
+        logger.exception("EXPLAIN capture failed for request %s", request_id)
+    finally:
+        with _explain_lock:
+            _explain_busy = False
+
+
+def shutdown_query_explainer() -> None:
+    global _explain_executor
+    with _explain_lock:
+        executor, _explain_executor = _explain_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
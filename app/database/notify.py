@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Callable
+
+import psycopg
+
+from app.database.core import db
+from app.databaseConnector import DATABASE_URL_ENV
+
+logger = logging.getLogger("spacebattle.db.notify")
+
+_RECONNECT_DELAY = 5.0
+_POLL_TIMEOUT = 1.0
+
+
+class NotificationListener:
+    """Background thread relaying Postgres ``LISTEN`` notifications to a callback.
+
+    Uses its own dedicated connection: a pooled connection cannot be parked in
+    ``LISTEN`` without starving the pool. Reconnects after connection loss.
+    """
+
+    def __init__(self, channel: str, handler: Callable[[str], None], *, dsn: str | None = None) -> None:
+        self._channel = channel
+        self._handler = handler
+        self._dsn = dsn or os.getenv(DATABASE_URL_ENV)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"listen-{self._channel}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self._dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {self._channel}")
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=_POLL_TIMEOUT):
+                            self._dispatch(notify.payload)
+            except psycopg.Error:
+                logger.exception("LISTEN %s connection lost; reconnecting", self._channel)
+                self._stop.wait(_RECONNECT_DELAY)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            self._handler(payload)
+        except Exception:
+            logger.exception("Notification handler for %s failed", self._channel)
+
+
+def publish(channel: str, payload: str) -> None:
+    """Send a ``NOTIFY`` on ``channel`` through the shared pool."""
+    db.execute("SELECT pg_notify(%s, %s)", [channel, payload])
@@ -1,24 +1,48 @@
 from __future__ import annotations
 
 import os
-from contextlib import contextmanager
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
 from threading import Lock
-from typing import Generator, Iterable
+from typing import Any, AsyncGenerator, Generator, Iterable
 
 import psycopg
-from psycopg_pool import ConnectionPool
+from psycopg_pool import AsyncConnectionPool, ConnectionPool, PoolTimeout
+
+from app.core.metrics import DB_POOL_WAIT
+from app.core.stats import register_stats_provider
 
 DATABASE_URL_ENV = "DATABASE_URL"
 MIN_POOL_SIZE_ENV = "DATABASE_MIN_POOL_SIZE"
 MAX_POOL_SIZE_ENV = "DATABASE_MAX_POOL_SIZE"
+PREPARE_THRESHOLD_ENV = "DATABASE_PREPARE_THRESHOLD"
 DEFAULT_MIN_POOL_SIZE = 1
 DEFAULT_MAX_POOL_SIZE = 5
+DEFAULT_PREPARE_THRESHOLD = 5
+
+# Open the pool during application startup; disable only when no database is used.
+WARM_UP_ON_STARTUP = os.getenv("DATABASE_WARMUP", "1").strip().lower() not in {"0", "false", "no", "off"}
+# Startup waits this long for ``min_size`` connections before giving up.
+STARTUP_TIMEOUT = float(os.getenv("DATABASE_STARTUP_TIMEOUT", "10"))
+# Validate each connection on checkout (one empty round-trip) so dead ones never reach a query.
+CHECK_ON_CHECKOUT = os.getenv("DATABASE_CHECK_ON_CHECKOUT", "1").strip().lower() not in {"0", "false", "no", "off"}
+PING_TIMEOUT = float(os.getenv("DATABASE_PING_TIMEOUT", "2"))
+# Longest a caller waits for a free connection before psycopg raises PoolTimeout (served as 503).
+POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "5"))
+
+logger = logging.getLogger("spacebattle.db")
 
 
 class DatabaseConfigurationError(RuntimeError):
     """Raised when the database connector is misconfigured."""
 
 
+class DatabaseUnavailableError(RuntimeError):
+    """Raised when the pool cannot be opened at startup."""
+
+
 def _resolve_pool_size(value: int | None, env_var: str, default: int) -> int:
     """Resolve an explicit or environment-provided pool size."""
     if value is not None:
@@ -47,6 +71,69 @@ def _resolve_pool_size(value: int | None, env_var: str, default: int) -> int:
     return parsed
 
 
+def _resolve_prepare_threshold() -> int | None:
+    """Resolve psycopg's prepare_threshold; ``none``/``off`` disables server-side prepares.
+
+    Disabling is required behind transaction-pooling proxies such as PgBouncer.
+    """
+    raw_value = os.getenv(PREPARE_THRESHOLD_ENV)
+    if raw_value is None or raw_value.strip() == "":
+        return DEFAULT_PREPARE_THRESHOLD
+    if raw_value.strip().lower() in {"none", "off", "false", "disabled"}:
+        return None
+
+    try:
+        parsed = int(raw_value)
+    except ValueError as exc:
+        raise DatabaseConfigurationError(
+            f"Invalid value for {PREPARE_THRESHOLD_ENV}: expected an integer or 'none', got {raw_value!r}."
+        ) from exc
+
+    if parsed < 0:
+        raise DatabaseConfigurationError(
+            f"Invalid value for {PREPARE_THRESHOLD_ENV}: must not be negative."
+        )
+
+    return parsed
+
+
+def _connection_kwargs() -> dict[str, object]:
+    """Per-connection settings applied by both pools."""
+    # autocommit ensures reads are immediate; prepared statements survive on pooled connections.
+    return {"autocommit": True, "prepare_threshold": _resolve_prepare_threshold()}
+
+
+def _resolve_pool_settings(
+    dsn: str | None,
+    min_size: int | None,
+    max_size: int | None,
+) -> tuple[str, int, int]:
+    """Resolve DSN and pool bounds shared by the sync and async connectors."""
+    resolved_dsn = dsn or os.getenv(DATABASE_URL_ENV)
+    if not resolved_dsn:
+        raise DatabaseConfigurationError(
+            "Database connection string missing. Set the DATABASE_URL environment variable."
+        )
+
+    resolved_min_size = _resolve_pool_size(
+        min_size,
+        MIN_POOL_SIZE_ENV,
+        DEFAULT_MIN_POOL_SIZE,
+    )
+    resolved_max_size = _resolve_pool_size(
+        max_size,
+        MAX_POOL_SIZE_ENV,
+        DEFAULT_MAX_POOL_SIZE,
+    )
+
+    if resolved_min_size > resolved_max_size:
+        raise DatabaseConfigurationError(
+            "Database pool misconfigured: min_size cannot be greater than max_size."
+        )
+
+    return resolved_dsn, resolved_min_size, resolved_max_size
+
+
 class DatabaseConnector:
     """Thin wrapper around a psycopg connection pool for PostgreSQL access."""
 
@@ -57,37 +144,52 @@ class DatabaseConnector:
         min_size: int | None = None,
         max_size: int | None = None,
     ) -> None:
-        self._dsn = dsn or os.getenv(DATABASE_URL_ENV)
-        if not self._dsn:
-            raise DatabaseConfigurationError(
-                "Database connection string missing. Set the DATABASE_URL environment variable."
-            )
-
-        resolved_min_size = _resolve_pool_size(
-            min_size,
-            MIN_POOL_SIZE_ENV,
-            DEFAULT_MIN_POOL_SIZE,
-        )
-        resolved_max_size = _resolve_pool_size(
-            max_size,
-            MAX_POOL_SIZE_ENV,
-            DEFAULT_MAX_POOL_SIZE,
+        self._dsn, resolved_min_size, resolved_max_size = _resolve_pool_settings(
+            dsn, min_size, max_size
         )
 
-        if resolved_min_size > resolved_max_size:
-            raise DatabaseConfigurationError(
-                "Database pool misconfigured: min_size cannot be greater than max_size."
-            )
+        self._min_size = resolved_min_size
+        self._max_size = resolved_max_size
+        self._pool = self._new_pool()
 
-        # psycopg_pool manages connection lifecycle for us. autocommit ensures reads are immediate.
-        self._pool = ConnectionPool(
+    def _new_pool(self) -> ConnectionPool:
+        # psycopg_pool manages connection lifecycle for us.
+        return ConnectionPool(
             conninfo=self._dsn,
-            min_size=resolved_min_size,
-            max_size=resolved_max_size,
-            kwargs={"autocommit": True},
+            min_size=self._min_size,
+            max_size=self._max_size,
+            kwargs=_connection_kwargs(),
+            check=ConnectionPool.check_connection if CHECK_ON_CHECKOUT else None,
+            timeout=POOL_TIMEOUT,
             open=False,
         )
 
+    def open(self, timeout: float = STARTUP_TIMEOUT) -> None:
+        """Open the pool and block until ``min_size`` connections are established."""
+        if not self._pool.closed:
+            return
+        try:
+            self._pool.open(wait=True, timeout=timeout)
+        except PoolTimeout as exc:
+            # A closed psycopg pool cannot be reopened; start over on the next attempt.
+            self._pool.close()
+            self._pool = self._new_pool()
+            raise DatabaseUnavailableError(
+                f"Could not open {self._min_size} database connection(s) within {timeout:g}s; "
+                "see the psycopg.pool warnings above for the underlying error."
+            ) from exc
+
+    def ping(self, timeout: float = PING_TIMEOUT) -> None:
+        """Run a trivial query; raises if no healthy connection is available within ``timeout``."""
+        if self._pool.closed:
+            self.open(timeout)
+        with self._pool.connection(timeout=timeout) as conn:
+            conn.execute("SELECT 1")
+
+    def stats(self) -> dict[str, Any]:
+        """Return ``ConnectionPool.get_stats()`` (waits, timeouts, usage) plus the pool state."""
+        return {"open": not self._pool.closed, **self._pool.get_stats()}
+
     def close(self) -> None:
         """Close the underlying connection pool."""
         self._pool.close()
@@ -96,8 +198,10 @@ class DatabaseConnector:
     def connection(self) -> Generator[psycopg.Connection, None, None]:
         """Provide a pooled connection as a context manager."""
         if self._pool.closed:
-            self._pool.open(wait=True)
+            self.open()
+        started = time.perf_counter()
         with self._pool.connection() as conn:  # type: ignore[assignment]
+            DB_POOL_WAIT.observe(time.perf_counter() - started, "sync")
             yield conn
 
     def iter_user_tables(self) -> Iterable[str]:
@@ -119,8 +223,63 @@ class DatabaseConnector:
                         yield f"{schemaname}.{tablename}"
 
 
+class AsyncDatabaseConnector:
+    """Async counterpart of :class:`DatabaseConnector` backed by ``AsyncConnectionPool``.
+
+    Lets ``async def`` routes await queries on the event loop instead of
+    parking an AnyIO threadpool worker for the whole round-trip.
+    """
+
+    def __init__(
+        self,
+        dsn: str | None = None,
+        *,
+        min_size: int | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        self._dsn, resolved_min_size, resolved_max_size = _resolve_pool_settings(
+            dsn, min_size, max_size
+        )
+        self._pool = AsyncConnectionPool(
+            conninfo=self._dsn,
+            min_size=resolved_min_size,
+            max_size=resolved_max_size,
+            kwargs=_connection_kwargs(),
+            check=AsyncConnectionPool.check_connection if CHECK_ON_CHECKOUT else None,
+            timeout=POOL_TIMEOUT,
+            open=False,
+        )
+        self._open_lock = asyncio.Lock()
+
+    async def open(self) -> None:
+        """Open the pool once; concurrent callers wait for the first opener."""
+        if not self._pool.closed:
+            return
+        async with self._open_lock:
+            if self._pool.closed:
+                await self._pool.open(wait=True)
+
+    async def close(self) -> None:
+        """Close the underlying connection pool."""
+        await self._pool.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {"open": not self._pool.closed, **self._pool.get_stats()}
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncGenerator[psycopg.AsyncConnection, None]:
+        """Provide a pooled async connection as a context manager."""
+        if self._pool.closed:
+            await self.open()
+        started = time.perf_counter()
+        async with self._pool.connection() as conn:
+            DB_POOL_WAIT.observe(time.perf_counter() - started, "async")
+            yield conn
+
+
 _connector: DatabaseConnector | None = None
 _connector_lock = Lock()
+_async_connector: AsyncDatabaseConnector | None = None
 
 
 def init_connector() -> DatabaseConnector:
@@ -141,6 +300,42 @@ def get_connector() -> DatabaseConnector:
     return connector
 
 
+def configured_max_pool_size() -> int:
+    """Return ``DATABASE_MAX_POOL_SIZE`` without creating a connector."""
+    return _resolve_pool_size(None, MAX_POOL_SIZE_ENV, DEFAULT_MAX_POOL_SIZE)
+
+
+def warm_up_connector(timeout: float = STARTUP_TIMEOUT) -> DatabaseConnector:
+    """Open the global pool with ``min_size`` connections; meant for application startup.
+
+    Raises :class:`DatabaseConfigurationError` or :class:`DatabaseUnavailableError`
+    so a misconfigured or unreachable database stops the process immediately.
+    """
+    connector = get_connector()
+    started = time.perf_counter()
+    connector.open(timeout)
+    connector.ping()
+    logger.info(
+        "Database pool ready: %d connection(s) in %.0f ms",
+        connector.stats().get("pool_size", 0),
+        (time.perf_counter() - started) * 1000,
+    )
+    return connector
+
+
+def pool_stats() -> dict[str, Any]:
+    """Stats of whichever pools have been created; creating none as a side effect."""
+    stats: dict[str, Any] = {}
+    if _connector is not None:
+        stats["sync"] = _connector.stats()
+    if _async_connector is not None:
+        stats["async"] = _async_connector.stats()
+    return stats
+
+
+register_stats_provider("db_pool", pool_stats)
+
+
 def shutdown_connector() -> None:
     """Tear down the connector if it exists."""
     global _connector
@@ -148,3 +343,29 @@ def shutdown_connector() -> None:
     if _connector is not None:
         _connector.close()
         _connector = None
+
+
+def init_async_connector() -> AsyncDatabaseConnector:
+    """Initialise the global async connector if needed and return it."""
+    global _async_connector
+
+    if _async_connector is None:
+        with _connector_lock:
+            if _async_connector is None:
+                _async_connector = AsyncDatabaseConnector()
+
+    return _async_connector
+
+
+def get_async_connector() -> AsyncDatabaseConnector:
+    """Return the global async connector, ensuring it has been initialised."""
+    return _async_connector or init_async_connector()
+
+
+async def shutdown_async_connector() -> None:
+    """Tear down the async connector if it exists."""
+    global _async_connector
+
+    if _async_connector is not None:
+        await _async_connector.close()
+        _async_connector = None
@@ -1,13 +1,36 @@
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.databaseConnector import shutdown_connector
+from fastapi.concurrency import run_in_threadpool
+from app.core.admission import configure_threadpool
+from app.core.mailer import smtp_pool
+from app.core.metrics import registry as metrics_registry
+from app.core.outbox import outbox
+from app.database import open_backend, shutdown_backend, shutdown_query_explainer
+from app.databaseConnector import WARM_UP_ON_STARTUP, shutdown_async_connector, shutdown_connector
+from app.repositories.users import start_cache_listener, stop_cache_listener
+from app.util.security import configure_bcrypt_cost, shutdown_password_executor
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # --- startup ---
-    # await init_cache()
+    configure_threadpool()
+    # Fail fast: an unreachable database aborts startup instead of the first request.
+    # (Postgres fills its pool here; the memory and SQLite backends open in milliseconds.)
+    if WARM_UP_ON_STARTUP:
+        await run_in_threadpool(open_backend)
+    await run_in_threadpool(configure_bcrypt_cost)
+    start_cache_listener()
+    await outbox.start()
+    await metrics_registry.start()
     yield
     # --- shutdown ---
+    await metrics_registry.stop()
+    await outbox.stop()
+    smtp_pool.close()
+    stop_cache_listener()
+    shutdown_password_executor()
+    shutdown_query_explainer()
+    shutdown_backend()
     shutdown_connector()
-    # await close_cache()
\ No newline at end of file
+    await shutdown_async_connector()
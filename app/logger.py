@@ -1,15 +1,102 @@
-import logging
-import inspect
+import atexit
 import json
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
+import logging
+import os
+import queue
 from dataclasses import asdict, is_dataclass
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+def _format_message(message) -> str:
+    """Format dicts, lists, or objects as JSON; strings stay unchanged."""
+    try:
+        # Dataclasses → dict
+        if is_dataclass(message):
+            message = asdict(message)
+
+        # Dicts, lists, tuples, objects → JSON
+        if isinstance(message, (dict, list, tuple)):
+            return json.dumps(message, ensure_ascii=False, default=str)
+        # Fallback: try to serialize object attributes
+        elif hasattr(message, "__dict__"):
+            return json.dumps(message.__dict__, ensure_ascii=False, default=str)
+        else:
+            return str(message)
+    except Exception as e:
+        return f"[Unserializable object: {e}] {repr(message)}"
+
+
+class _Deferred:
+    """Log argument that formats its payload only when the record is rendered."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        return _format_message(self.payload)
+
+
+class _SnapshotQueueHandler(QueueHandler):
+    """Queue records with their message resolved, leaving the rest to the listener.
+
+    The message is rendered here (only for enabled records) so later mutation of
+    a logged dict cannot change what is written; timestamps, formatting and file
+    I/O happen on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listeners: dict[str, tuple[queue.SimpleQueue, QueueListener]] = {}
+
+
+def _get_queue(log_file: str, max_bytes: int, backup_count: int) -> queue.SimpleQueue:
+    """Return the queue feeding the single listener thread that owns ``log_file``."""
+    path = os.path.abspath(log_file)
+    existing = _listeners.get(path)
+    if existing is not None:
+        return existing[0]
+
+    formatter = logging.Formatter(
+        "%(asctime)s [%(levelname)s] %(name)s -> %(filename)s:%(funcName)s -> %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[path] = (log_queue, listener)
+    return log_queue
+
+
+def stop_log_listeners() -> None:
+    """Flush and stop every listener thread (pending records are written first)."""
+    while _listeners:
+        _, (_, listener) = _listeners.popitem()
+        listener.stop()
+
+
+atexit.register(stop_log_listeners)
 
 
 class Logger:
     """
     Advanced logger that supports strings, dicts, lists, tuples, and objects.
-    Logs to console and rotating file.
+    Logs to console and rotating file from a background listener thread.
     """
 
     def __init__(
@@ -22,61 +109,22 @@ class Logger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
 
-        formatter = logging.Formatter(
-            "%(asctime)s [%(levelname)s] %(name)s -> %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-
-        file_handler = RotatingFileHandler(
-            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(formatter)
-
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(formatter)
-
-        if not self.logger.hasHandlers():
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
-
-    def _get_origin(self) -> str:
-        """Return the filename and function where the log was called."""
-        frame = inspect.stack()[2]
-        filename = frame.filename.split("/")[-1]
-        func_name = frame.function
-        return f"{filename}:{func_name}"
-
-    def _format_message(self, message):
-        """Format dicts, lists, or objects as JSON; strings stay unchanged."""
-        try:
-            # Dataclasses → dict
-            if is_dataclass(message):
-                message = asdict(message)
-
-            # Dicts, lists, tuples, objects → JSON
-            if isinstance(message, (dict, list, tuple)):
-                return json.dumps(message, indent=2, ensure_ascii=False)
-            # Fallback: try to serialize object attributes
-            elif hasattr(message, "__dict__"):
-                return json.dumps(message.__dict__, indent=2, ensure_ascii=False)
-            else:
-                return str(message)
-        except Exception as e:
-            return f"[Unserializable object: {e}] {repr(message)}"
+        if not self.logger.handlers:
+            self.logger.addHandler(_SnapshotQueueHandler(_get_queue(log_file, max_bytes, backup_count)))
+            # The listener already writes to the console; do not repeat via root.
+            self.logger.propagate = False
+
+    # stacklevel=2 makes %(filename)s/%(funcName)s point at our caller, which
+    # the logging module resolves with a cheap frame walk.
+
+    def log_debug(self, message):
+        self.logger.debug("%s", _Deferred(message), stacklevel=2)
 
     def log_info(self, message):
-        origin = self._get_origin()
-        formatted = self._format_message(message)
-        self.logger.info(f"{origin} -> {formatted}")
+        self.logger.info("%s", _Deferred(message), stacklevel=2)
 
     def log_warning(self, message):
-        origin = self._get_origin()
-        formatted = self._format_message(message)
-        self.logger.warning(f"{origin} -> {formatted}")
+        self.logger.warning("%s", _Deferred(message), stacklevel=2)
 
     def log_error(self, message):
-        origin = self._get_origin()
-        formatted = self._format_message(message)
-        self.logger.error(f"{origin} -> {formatted}")
\ No newline at end of file
+        self.logger.error("%s", _Deferred(message), stacklevel=2)
@@ -6,12 +6,20 @@ from app.core.handlers import register_exception_handlers
 from app.routes import api_router
 from app.config import API_TITLE, API_DESCRIPTION, API_VERSION
 from app.core.middleware import register_middlewares
+from app.core.responses import FastJSONResponse
+from app.lifecycle import lifespan
 
 # Logging initialisieren
-setup_logging("INFO")                
+setup_logging()
 
 # define app
-app = FastAPI(title=API_TITLE, description=API_DESCRIPTION, version=API_VERSION)
+app = FastAPI(
+    title=API_TITLE,
+    description=API_DESCRIPTION,
+    version=API_VERSION,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 # register middleware
 register_middlewares(app)
@@ -41,3 +41,30 @@ class UserUpdate(BaseModel):
     blocked: bool | None = None
     role: UserRole | None = None
     language: UserLanguage | None = None
+
+
+class UserBulkMode(str, Enum):
+    insert = "insert"
+    upsert = "upsert"
+    copy = "copy"
+
+
+class UserBulkStatus(str, Enum):
+    inserted = "inserted"
+    updated = "updated"
+    conflict = "conflict"
+
+
+class UserBulkItem(BaseModel):
+    index: int
+    email: str
+    status: UserBulkStatus
+    id: int | None = None
+    reason: str | None = None
+
+
+class UserBulkResult(BaseModel):
+    inserted: int
+    updated: int
+    conflicts: int
+    items: list[UserBulkItem]
@@ -1,22 +1,87 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Generic, TypeVar
+import os
+import types
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Generic, Iterable, Iterator, TypeVar, Union, get_args, get_origin
 
-from app.database.core import (
-    build_delete,
-    build_insert,
-    build_select,
-    build_update,
-    db,
-)
+from pydantic import BaseModel
+
+from app.database.backends import UPSERT_FLAG as _UPSERT_FLAG
+from app.database.backends import get_async_backend, get_backend
+from app.database.core import Seek
 
 ModelT = TypeVar("ModelT")
+BaseModelT = TypeVar("BaseModelT", bound=BaseModel)
 UpdateModelT = TypeVar("UpdateModelT")
 InsertModelT = TypeVar("InsertModelT")
 
+BULK_CHUNK_SIZE_ENV = "DATABASE_BULK_CHUNK_SIZE"
+DEFAULT_BULK_CHUNK_SIZE = int(os.getenv(BULK_CHUNK_SIZE_ENV) or 500)
+# Validate database rows like request input instead of trusting them (debugging aid).
+STRICT_MODEL_VALIDATION = os.getenv("STRICT_MODEL_VALIDATION", "false").lower() == "true"
 
-class Repository(Generic[ModelT, UpdateModelT, InsertModelT]):
-    """Generic helper encapsulating common CRUD helpers for simple tables."""
+
+def _enum_type(annotation: Any) -> type[Enum] | None:
+    """Return the Enum behind ``annotation`` (also ``Enum | None``), if any."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = members[0] if len(members) == 1 else None
+    return annotation if isinstance(annotation, type) and issubclass(annotation, Enum) else None
+
+
+def row_model_factory(model: type[BaseModelT]) -> Callable[[dict[str, Any]], BaseModelT]:
+    """Build ``model`` instances from rows of our own tables without validating them.
+
+    The columns already have the model's types, so ``model_construct`` only has
+    to turn enum columns (stored as plain strings) into their members; that
+    skips validators such as ``EmailStr``'s, by far the largest cost of reading
+    rows. ``STRICT_MODEL_VALIDATION=true`` validates every row instead.
+    """
+    if STRICT_MODEL_VALIDATION:
+        return model.model_validate
+
+    enums = {
+        name: enum
+        for name, info in model.model_fields.items()
+        if (enum := _enum_type(info.annotation)) is not None
+    }
+    construct = model.model_construct
+
+    def build(row: dict[str, Any]) -> BaseModelT:
+        if enums:
+            row = dict(row)
+            for name, enum in enums.items():
+                value = row.get(name)
+                if value is not None and not isinstance(value, enum):
+                    row[name] = enum(value)
+        return construct(**row)
+
+    return build
+
+
+@dataclass
+class BulkConflict:
+    """A bulk row that was skipped because its conflict key already exists."""
+
+    index: int
+    key: str
+    value: Any
+    reason: str
+
+
+@dataclass
+class BulkWriteResult(Generic[ModelT]):
+    """Per-row outcome of ``insert_many``/``upsert_many``; entries carry the input index."""
+
+    inserted: list[tuple[int, ModelT]] = field(default_factory=list)
+    updated: list[tuple[int, ModelT]] = field(default_factory=list)
+    conflicts: list[BulkConflict] = field(default_factory=list)
+
+
+class _RepositoryBase(Generic[ModelT, UpdateModelT, InsertModelT]):
+    """Payload preparation shared by the sync and async repositories."""
 
     def __init__(
         self,
@@ -49,6 +114,62 @@ class Repository(Generic[ModelT, UpdateModelT, InsertModelT]):
             prepared[key] = value.value if hasattr(value, "value") else value
         return prepared
 
+    def _prepare_bulk(
+        self,
+        payloads: Iterable[InsertModelT],
+        conflict_key: str | None,
+        result: BulkWriteResult[ModelT],
+    ) -> dict[tuple[str, ...], list[tuple[int, dict[str, Any]]]]:
+        """Prepare rows, drop in-batch key duplicates and group rows by column set."""
+        groups: dict[tuple[str, ...], list[tuple[int, dict[str, Any]]]] = {}
+        seen: set[Any] = set()
+        for index, payload in enumerate(payloads):
+            data = self._prepare_insert(payload)
+            if not data:
+                raise ValueError(f"Bulk row {index} resulted in no columns")
+            if conflict_key is not None:
+                if conflict_key not in data:
+                    raise ValueError(f"Bulk row {index} is missing conflict key {conflict_key!r}")
+                value = data[conflict_key]
+                if value in seen:
+                    result.conflicts.append(BulkConflict(index, conflict_key, value, "duplicate in batch"))
+                    continue
+                seen.add(value)
+            groups.setdefault(tuple(data.keys()), []).append((index, data))
+        return groups
+
+    def _collect_bulk_rows(
+        self,
+        chunk: list[tuple[int, dict[str, Any]]],
+        rows: list[dict[str, Any]],
+        conflict_key: str | None,
+        upsert: bool,
+        result: BulkWriteResult[ModelT],
+    ) -> None:
+        if conflict_key is None:
+            # Without a key every row was inserted; RETURNING follows VALUES order.
+            for (index, _), row in zip(chunk, rows):
+                result.inserted.append((index, self._to_model(row)))
+            return
+
+        by_key = {row[conflict_key]: row for row in rows}
+        for index, data in chunk:
+            value = data[conflict_key]
+            row = by_key.get(value)
+            if row is None:
+                result.conflicts.append(BulkConflict(index, conflict_key, value, "already exists"))
+                continue
+            inserted = row.pop(_UPSERT_FLAG, True)
+            target = result.inserted if inserted or not upsert else result.updated
+            target.append((index, self._to_model(row)))
+
+    @staticmethod
+    def _finish_bulk(result: BulkWriteResult[ModelT]) -> BulkWriteResult[ModelT]:
+        result.inserted.sort(key=lambda item: item[0])
+        result.updated.sort(key=lambda item: item[0])
+        result.conflicts.sort(key=lambda item: item.index)
+        return result
+
     def _default_prepare_insert(self, payload: InsertModelT) -> dict[str, Any]:
         if payload is None:
             return {}
@@ -65,6 +186,11 @@ class Repository(Generic[ModelT, UpdateModelT, InsertModelT]):
             prepared[key] = value.value if hasattr(value, "value") else value
         return prepared
 
+
+
+class Repository(_RepositoryBase[ModelT, UpdateModelT, InsertModelT]):
+    """Generic helper encapsulating common CRUD helpers for simple tables."""
+
     def get_by_id(self, entity_id: int) -> ModelT | None:
         return self.get_one(where={"id": entity_id})
 
@@ -75,59 +201,261 @@ class Repository(Generic[ModelT, UpdateModelT, InsertModelT]):
         *,
         order_by: str | None = None,
         where: dict[str, Any] | None = None,
+        seek: Seek | None = None,
     ) -> list[ModelT]:
-        sql, params = build_select(
+        rows = get_backend().select(
             self._table,
             where=where,
             order_by=order_by or self._default_order_by,
             limit=limit,
             offset=offset,
+            seek=seek,
         )
-        rows = db.fetch_all(sql, params)
         return [self._to_model(row) for row in rows]
 
-    def get_one(
+    def stream(
         self,
+        limit: int | None = None,
         *,
-        where: dict[str, Any],
-    ) -> ModelT | None:
-        sql, params = build_select(
+        order_by: str | None = None,
+        where: dict[str, Any] | None = None,
+        seek: Seek | None = None,
+    ) -> Iterator[list[ModelT]]:
+        """Like :meth:`list`, but yields models batch by batch (from a server-side cursor on Postgres)."""
+        batches = get_backend().stream(
             self._table,
             where=where,
-            limit=1,
+            order_by=order_by or self._default_order_by,
+            limit=limit,
+            seek=seek,
         )
-        row = db.fetch_one(sql, params)
+        for rows in batches:
+            yield [self._to_model(row) for row in rows]
+
+    def get_one(
+        self,
+        *,
+        where: dict[str, Any],
+    ) -> ModelT | None:
+        row = get_backend().select_one(self._table, where)
         return self._to_model(row) if row else None
 
-    def insert(self, payload: InsertModelT, *, returning: str | None = "id") -> ModelT | dict[str, Any] | None:
+    def insert(
+        self,
+        payload: InsertModelT,
+        *,
+        returning: str | None = "id",
+        reread: bool = True,
+    ) -> ModelT | dict[str, Any] | None:
+        """Insert a row.
+
+        ``returning="*"`` hands back the model from the INSERT itself. For any
+        other column list the entity is re-read by id unless ``reread`` is False,
+        in which case the returned columns come back as a plain dict.
+        """
         data = self._prepare_insert(payload)
         if not data:
             raise ValueError("Insert payload resulted in no columns")
 
-        sql, params = build_insert(self._table, data, returning=returning)
-        if returning:
-            row = db.fetch_one(sql, params)
-            if not row:
-                return None
-            if returning.strip() == "*":
-                return self._to_model(row)
-            if "id" in row:
-                entity = self.get_by_id(row["id"])
-                return entity if entity is not None else row
-            return row
-
-        db.execute(sql, params)
-        return None
+        row = get_backend().insert(self._table, data, returning)
+        if not returning or not row:
+            return None
+        if returning.strip() == "*":
+            return self._to_model(row)
+        if reread and "id" in row:
+            entity = self.get_by_id(row["id"])
+            return entity if entity is not None else row
+        return row
 
     def update(self, entity_id: int, patch: UpdateModelT) -> ModelT | None:
+        """Apply ``patch`` and return the updated model in a single round-trip."""
         data = self._prepare_update(patch)
         if not data:
             return self.get_by_id(entity_id)
 
-        sql, params = build_update(self._table, data, where={"id": entity_id})
-        db.execute(sql, params)
-        return self.get_by_id(entity_id)
+        row = get_backend().update_returning(self._table, data, {"id": entity_id})
+        return self._to_model(row) if row else None
+
+    def update_no_return(self, entity_id: int, patch: UpdateModelT) -> int:
+        """Fire-and-forget update; returns the affected row count without reading the row."""
+        data = self._prepare_update(patch)
+        if not data:
+            return 0
+
+        return get_backend().update(self._table, data, {"id": entity_id})
 
     def delete(self, entity_id: int) -> int:
-        sql, params = build_delete(self._table, where={"id": entity_id})
-        return db.execute(sql, params)
+        return get_backend().delete(self._table, {"id": entity_id})
+
+    def insert_many(
+        self,
+        payloads: Iterable[InsertModelT],
+        *,
+        conflict_key: str | None = None,
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    ) -> BulkWriteResult[ModelT]:
+        """Insert rows with chunked multi-row ``VALUES`` statements.
+
+        With ``conflict_key`` set, rows whose key already exists (in the table or
+        earlier in the batch) are reported as conflicts instead of aborting the batch.
+        """
+        return self._write_many(payloads, conflict_key=conflict_key, upsert=False, chunk_size=chunk_size)
+
+    def upsert_many(
+        self,
+        payloads: Iterable[InsertModelT],
+        *,
+        conflict_key: str,
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    ) -> BulkWriteResult[ModelT]:
+        """Insert rows or update the existing row sharing ``conflict_key``."""
+        return self._write_many(payloads, conflict_key=conflict_key, upsert=True, chunk_size=chunk_size)
+
+    def _write_many(
+        self,
+        payloads: Iterable[InsertModelT],
+        *,
+        conflict_key: str | None,
+        upsert: bool,
+        chunk_size: int,
+    ) -> BulkWriteResult[ModelT]:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        result: BulkWriteResult[ModelT] = BulkWriteResult()
+        groups = self._prepare_bulk(payloads, conflict_key, result)
+        on_conflict = "update" if upsert else ("nothing" if conflict_key else None)
+
+        backend = get_backend()
+        for entries in groups.values():
+            for start in range(0, len(entries), chunk_size):
+                chunk = entries[start:start + chunk_size]
+                rows = backend.insert_many(
+                    self._table,
+                    [data for _, data in chunk],
+                    conflict_key=conflict_key,
+                    on_conflict=on_conflict,
+                )
+                self._collect_bulk_rows(chunk, rows, conflict_key, upsert, result)
+
+        return self._finish_bulk(result)
+
+    def copy_many(self, payloads: Iterable[InsertModelT]) -> int:
+        """Stream rows through ``COPY ... FROM STDIN``.
+
+        Fastest path for seeding, but all-or-nothing: a single conflict aborts the copy.
+        """
+        prepared = (self._prepare_insert(payload) for payload in payloads)
+        first = next(prepared, None)
+        if not first:
+            return 0
+        cols = tuple(first.keys())
+
+        def rows() -> Iterable[list[Any]]:
+            yield list(first.values())
+            for index, data in enumerate(prepared, start=1):
+                if tuple(data.keys()) != cols:
+                    raise ValueError(f"Bulk row {index} does not match the columns of the first row")
+                yield list(data.values())
+
+        return get_backend().copy(self._table, cols, rows())
+
+
+class AsyncRepository(_RepositoryBase[ModelT, UpdateModelT, InsertModelT]):
+    """Async variant of :class:`Repository` running on the async storage backend."""
+
+    async def get_by_id(self, entity_id: int) -> ModelT | None:
+        return await self.get_one(where={"id": entity_id})
+
+    async def list(
+        self,
+        limit: int | None = None,
+        offset: int | None = None,
+        *,
+        order_by: str | None = None,
+        where: dict[str, Any] | None = None,
+        seek: Seek | None = None,
+    ) -> list[ModelT]:
+        rows = await get_async_backend().select(
+            self._table,
+            where=where,
+            order_by=order_by or self._default_order_by,
+            limit=limit,
+            offset=offset,
+            seek=seek,
+        )
+        return [self._to_model(row) for row in rows]
+
+    async def stream(
+        self,
+        limit: int | None = None,
+        *,
+        order_by: str | None = None,
+        where: dict[str, Any] | None = None,
+        seek: Seek | None = None,
+    ) -> AsyncIterator[list[ModelT]]:
+        """Like :meth:`list`, but yields models batch by batch (from a server-side cursor on Postgres)."""
+        batches = get_async_backend().stream(
+            self._table,
+            where=where,
+            order_by=order_by or self._default_order_by,
+            limit=limit,
+            seek=seek,
+        )
+        async for rows in batches:
+            yield [self._to_model(row) for row in rows]
+
+    async def get_one(
+        self,
+        *,
+        where: dict[str, Any],
+    ) -> ModelT | None:
+        row = await get_async_backend().select_one(self._table, where)
+        return self._to_model(row) if row else None
+
+    async def insert(
+        self,
+        payload: InsertModelT,
+        *,
+        returning: str | None = "id",
+        reread: bool = True,
+    ) -> ModelT | dict[str, Any] | None:
+        """Insert a row.
+
+        ``returning="*"`` hands back the model from the INSERT itself. For any
+        other column list the entity is re-read by id unless ``reread`` is False,
+        in which case the returned columns come back as a plain dict.
+        """
+        data = self._prepare_insert(payload)
+        if not data:
+            raise ValueError("Insert payload resulted in no columns")
+
+        row = await get_async_backend().insert(self._table, data, returning)
+        if not returning or not row:
+            return None
+        if returning.strip() == "*":
+            return self._to_model(row)
+        if reread and "id" in row:
+            entity = await self.get_by_id(row["id"])
+            return entity if entity is not None else row
+        return row
+
+    async def update(self, entity_id: int, patch: UpdateModelT) -> ModelT | None:
+        """Apply ``patch`` and return the updated model in a single round-trip."""
+        data = self._prepare_update(patch)
+        if not data:
+            return await self.get_by_id(entity_id)
+
+        row = await get_async_backend().update_returning(self._table, data, {"id": entity_id})
+        return self._to_model(row) if row else None
+
+    async def update_no_return(self, entity_id: int, patch: UpdateModelT) -> int:
+        """Fire-and-forget update; returns the affected row count without reading the row."""
+        data = self._prepare_update(patch)
+        if not data:
+            return 0
+
+        return await get_async_backend().update(self._table, data, {"id": entity_id})
+
+    async def delete(self, entity_id: int) -> int:
+        return await get_async_backend().delete(self._table, {"id": entity_id})
@@ -1,17 +1,35 @@
 from __future__ import annotations
 
+import logging
+import os
+import uuid
 from dataclasses import dataclass
-from typing import Any
+from threading import Lock
+from typing import Any, Iterable, Iterator
 
+from app.core.stats import register_stats_provider
 from app.models.users import User, UserCreate, UserRole, UserUpdate
-from app.repositories.base import Repository
-from app.database.core import db
+from app.repositories.base import BulkWriteResult, Repository, row_model_factory
+from app.database.backends import PostgresBackend, get_backend
+from app.database.core import Seek, db
+from app.database.notify import NotificationListener, publish
+from app.util.cache import MISSING, TTLCache
 
 TABLE = "users"
 
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+# Remember "no such user" for this long; 0 disables negative caching.
+USER_CACHE_NEGATIVE_TTL = float(os.getenv("USER_CACHE_NEGATIVE_TTL", "0"))
+# Broadcast invalidations to other workers through Postgres LISTEN/NOTIFY.
+USER_CACHE_BROADCAST = os.getenv("USER_CACHE_BROADCAST", "false").lower() == "true"
+USER_CACHE_CHANNEL = "users_cache"
 
-def _user_factory(payload: dict[str, Any]) -> User:
-    return User(**payload)
+logger = logging.getLogger("spacebattle.users")
+
+
+# Rows are trusted; see row_model_factory for the STRICT_MODEL_VALIDATION switch.
+_user_factory = row_model_factory(User)
 
 
 def _prepare_user_update(patch: UserUpdate) -> dict[str, Any]:
@@ -33,12 +51,137 @@ _repo = Repository[User, UserUpdate, UserCreate](
 )
 
 
+# Read-through cache: ("id", id) holds the User, ("email", email) only the id.
+# Invalidating the id entry therefore also invalidates every email lookup
+# pointing at it, even if the email entry itself is still cached.
+#
+# Every invalidation bumps _generation. Readers snapshot it before going to
+# the database and only cache what they read if no invalidation happened in
+# between, so a write racing a cache miss cannot put the old row back.
+
+_NEGATIVE = object()
+_cache: TTLCache[tuple[str, Any], Any] = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+_cache_lock = Lock()
+_generation = 0
+_instance_id = uuid.uuid4().hex
+_listener: NotificationListener | None = None
+
+register_stats_provider("user_cache", _cache.stats)
+
+
+def _remember(key: tuple[str, Any], user: User | None, generation: int) -> None:
+    """Cache a database read taken at ``generation``, unless it was invalidated since."""
+    with _cache_lock:
+        if generation != _generation:
+            return
+        if user is None:
+            if USER_CACHE_NEGATIVE_TTL > 0:
+                _cache.set(key, _NEGATIVE, ttl=USER_CACHE_NEGATIVE_TTL)
+            return
+        _cache.set(("id", user.id), user)
+        _cache.set(("email", user.email), user.id)
+
+
+def _forget(*, user_id: int | None = None, email: str | None = None) -> None:
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        if user_id is not None:
+            _cache.pop(("id", user_id))
+        if email is not None:
+            _cache.pop(("email", email))
+
+
+def _forget_all() -> None:
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        _cache.clear()
+
+
+def _broadcasting() -> bool:
+    # LISTEN/NOTIFY needs Postgres; other backends are single-process anyway.
+    return USER_CACHE_BROADCAST and isinstance(get_backend(), PostgresBackend)
+
+
+def _invalidate(*, user_id: int | None = None, email: str | None = None) -> None:
+    _forget(user_id=user_id, email=email)
+    if _broadcasting():
+        if user_id is not None:
+            publish(USER_CACHE_CHANNEL, f"{_instance_id}:id:{user_id}")
+        if email is not None:
+            publish(USER_CACHE_CHANNEL, f"{_instance_id}:email:{email}")
+
+
+def _invalidate_all() -> None:
+    _forget_all()
+    if _broadcasting():
+        publish(USER_CACHE_CHANNEL, f"{_instance_id}:*")
+
+
+def _on_notification(payload: str) -> None:
+    origin, _, rest = payload.partition(":")
+    if origin == _instance_id:
+        return
+    kind, _, value = rest.partition(":")
+    if kind == "*":
+        _forget_all()
+    elif kind == "id":
+        _forget(user_id=int(value))
+    elif kind == "email":
+        _forget(email=value)
+
+
+def start_cache_listener() -> None:
+    """Follow invalidations from other workers when broadcasting is enabled."""
+    global _listener
+    if USER_CACHE_BROADCAST and not _broadcasting():
+        logger.warning(
+            "USER_CACHE_BROADCAST needs the postgres backend; ignoring it for %r",
+            get_backend().name,
+        )
+        return
+    if USER_CACHE_BROADCAST and _cache.enabled and _listener is None:
+        _listener = NotificationListener(USER_CACHE_CHANNEL, _on_notification)
+        _listener.start()
+
+
+def stop_cache_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_by_id(user_id: int) -> User | None:
-    return _repo.get_by_id(user_id)
+    cached = _cache.get(("id", user_id))
+    if cached is _NEGATIVE:
+        return None
+    if cached is not MISSING:
+        return cached
+    generation = _generation
+    user = _repo.get_by_id(user_id)
+    _remember(("id", user_id), user, generation)
+    return user
 
 
 def get_one(where: dict[str, Any]) -> User | None:
-    return _repo.get_one(where=where)
+    if where.keys() != {"email"}:
+        return _repo.get_one(where=where)
+
+    email = where["email"]
+    cached_id = _cache.get(("email", email))
+    if cached_id is _NEGATIVE:
+        return None
+    if cached_id is not MISSING:
+        user = _cache.get(("id", cached_id))
+        if isinstance(user, User) and user.email == email:
+            return user
+
+    generation = _generation
+    user = _repo.get_one(where=where)
+    _remember(("email", email), user, generation)
+    return user
 
 
 def list_users(
@@ -47,22 +190,63 @@ def list_users(
     offset: int | None = None,
     *,
     order_by: str | None = None,
+    seek: Seek | None = None,
 ) -> list[User]:
-    return _repo.list(offset=offset, limit=limit, where=where, order_by=order_by)
+    return _repo.list(offset=offset, limit=limit, where=where, order_by=order_by, seek=seek)
+
+
+def stream_users(
+    where: dict[str, Any] | None = None,
+    limit: int | None = None,
+    *,
+    order_by: str | None = None,
+    seek: Seek | None = None,
+) -> Iterator[list[User]]:
+    return _repo.stream(limit=limit, where=where, order_by=order_by, seek=seek)
 
 
 def create(payload: UserCreate) -> User:
     created = _repo.insert(payload, returning="*")
-    if isinstance(created, User):
-        return created
+    _invalidate(email=payload.email)
     if isinstance(created, dict):
-        return _user_factory(created)
-    raise RuntimeError("Repository returned no data for created user")
+        created = _user_factory(created)
+    if not isinstance(created, User):
+        raise RuntimeError("Repository returned no data for created user")
+    # Ids are sequential: a cached miss for the next id must not outlive this insert.
+    _invalidate(user_id=created.id)
+    return created
+
+
+def bulk_create(payloads: Iterable[UserCreate], *, upsert: bool = False) -> BulkWriteResult[User]:
+    """Insert (or upsert) many users keyed by email, reporting per-row conflicts."""
+    try:
+        if upsert:
+            return _repo.upsert_many(payloads, conflict_key="email")
+        return _repo.insert_many(payloads, conflict_key="email")
+    finally:
+        _invalidate_all()
+
+
+def copy_create(payloads: Iterable[UserCreate]) -> int:
+    try:
+        return _repo.copy_many(payloads)
+    finally:
+        _invalidate_all()
 
 
 def update(user_id: int, patch: UserUpdate) -> User | None:
-    return _repo.update(user_id, patch)
+    user = _repo.update(user_id, patch)
+    _invalidate(user_id=user_id, email=getattr(patch, "email", None))
+    return user
+
+
+def update_no_return(user_id: int, patch: UserUpdate) -> int:
+    affected = _repo.update_no_return(user_id, patch)
+    _invalidate(user_id=user_id, email=getattr(patch, "email", None))
+    return affected
 
 
 def delete(user_id: int) -> int:
-    return _repo.delete(user_id)
+    affected = _repo.delete(user_id)
+    _invalidate(user_id=user_id)
+    return affected
@@ -1,18 +1,33 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Response
+import logging
+
+from fastapi import APIRouter, BackgroundTasks, Response
+from fastapi.concurrency import run_in_threadpool
 from psycopg import errors
 
 from app.core.auth import create_access_token
 from app.core.errors import AppHttpStatus
 from app.core.exceptions import AlreadyExistsError, UnauthorizedError, UserNotValidatedError, UserBlockedError
 from app.core.openapi import with_errors
-from app.util.security import hash_password, verify_password
+from app.core.responses import TrustedResponseRoute
+from app.util.security import hash_password_async, needs_rehash, verify_password_async
 from app.models.auth import LoginRequest, RegisterRequest, TokenResponse, VerifyRequest, ResetPasswordRequest
 from app.models.users import UserCreate, UserUpdate
 from app.repositories import users as users_repo
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=TrustedResponseRoute)
+
+logger = logging.getLogger("spacebattle.auth")
+
+
+async def _rehash_password(user_id: int, password: str) -> None:
+    """Upgrade a stored hash to the active bcrypt cost after a successful login."""
+    try:
+        new_hash = await hash_password_async(password)
+        await run_in_threadpool(users_repo.update_no_return, user_id, UserUpdate(password_hash=new_hash))
+    except Exception:
+        logger.exception("Failed to rehash password for user %s", user_id)
 
 
 @router.post(
@@ -21,14 +36,18 @@ router = APIRouter(prefix="/auth", tags=["auth"])
     status_code=AppHttpStatus.OK,
     responses=with_errors(),
 )
-def login(payload: LoginRequest) -> TokenResponse:
-    user = users_repo.get_one(where={"email": payload.email})
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, background_tasks: BackgroundTasks) -> TokenResponse:
+    # The lookup returns its pool connection before bcrypt starts on the hashing pool.
+    user = await run_in_threadpool(users_repo.get_one, {"email": payload.email})
+    if not user or not await verify_password_async(payload.password, user.password_hash):
         raise UnauthorizedError("Invalid credentials")
     if not user.verified:
         raise UserNotValidatedError("User account is not verified")
     if user.blocked:
         raise UserBlockedError("User account is blocked")
+    if needs_rehash(user.password_hash):
+        # Runs after the response is sent, so the login itself pays no extra hash.
+        background_tasks.add_task(_rehash_password, user.id, payload.password)
     token = create_access_token(subject=user.id, role=user.role, language=user.language)
     return TokenResponse(access_token=token, user=user)
 
@@ -39,17 +58,18 @@ def login(payload: LoginRequest) -> TokenResponse:
     status_code=AppHttpStatus.CREATED,
     responses=with_errors(),
 )
-def register(payload: RegisterRequest) -> TokenResponse:
+async def register(payload: RegisterRequest) -> TokenResponse:
+    password_hash = await hash_password_async(payload.password)
     try:
-        user = users_repo.create(UserCreate(
+        user = await run_in_threadpool(users_repo.create, UserCreate(
             name=payload.name,
             email=payload.email,
-            password_hash=hash_password(payload.password),
+            password_hash=password_hash,
         ))
     except errors.UniqueViolation as exc:
         raise AlreadyExistsError("Email already registered") from exc
 
-    token = create_access_token(subject=user.id, role=user.role)
+    token = create_access_token(subject=user.id, role=user.role, language=user.language)
     return TokenResponse(access_token=token, user=user)
 
 
@@ -79,16 +99,16 @@ def register(payload: VerifyRequest) -> TokenResponse:
     response_class=Response,
     responses=with_errors({AppHttpStatus.NO_CONTENT: {"description": "Password updated if user exists"}}),
 )
-def reset_password(payload: ResetPasswordRequest) -> Response:
+async def reset_password(payload: ResetPasswordRequest) -> Response:
     """Reset a user's password by email. Always returns 204.
 
     If the user does not exist, still return 204 to avoid enumeration.
     Optional token is accepted for future validation.
     """
-    user = users_repo.get_one({"email": payload.email})
+    user = await run_in_threadpool(users_repo.get_one, {"email": payload.email})
     if not user:
         return Response(status_code=AppHttpStatus.NO_CONTENT)
     # TODO: validate payload.token if/when reset tokens are issued
-    new_hash = hash_password(payload.password)
-    users_repo.update(user.id, UserUpdate(password_hash=new_hash))
+    new_hash = await hash_password_async(payload.password)
+    await run_in_threadpool(users_repo.update_no_return, user.id, UserUpdate(password_hash=new_hash))
     return Response(status_code=AppHttpStatus.NO_CONTENT)
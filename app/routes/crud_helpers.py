@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Iterable, Mapping
+import base64
+import binascii
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Mapping
 
 from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
 
 from app.core.errors import AppHttpStatus
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import BadRequestError, NotFoundError
+from app.core.middleware import NEXT_CURSOR_HEADER
+from app.database.core import Seek
 
 
 def _parse_bool(raw: str) -> bool:
@@ -91,6 +101,182 @@ def sanitize_order_by(order_by: str | None, allowed_columns: Iterable[str]) -> s
     return None
 
 
+def _split_order_by(order_by: str | None) -> tuple[str, bool]:
+    """Split a sanitized ``order_by`` into (column, descending); defaults to ``id``."""
+    if not order_by:
+        return "id", False
+    col, _, direction = order_by.partition(" ")
+    return col, direction.upper() == "DESC"
+
+
+def encode_cursor(seek: Seek, last_item: Any) -> str:
+    """Encode the keyset position after ``last_item`` as an opaque URL-safe token."""
+    if isinstance(last_item, Mapping):
+        value, last_id = last_item[seek.column], last_item["id"]
+    else:
+        value, last_id = getattr(last_item, seek.column), getattr(last_item, "id")
+
+    kind = None
+    if isinstance(value, Enum):
+        value = value.value
+    elif isinstance(value, datetime):
+        value, kind = value.isoformat(), "dt"
+
+    raw = {"c": seek.column, "d": seek.descending, "v": value, "i": last_id}
+    if kind:
+        raw["t"] = kind
+    data = json.dumps(raw, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _cursor_value_matches(value: Any, expected: type) -> bool:
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, expected)
+
+
+def decode_cursor(token: str, allowed_columns: Iterable[str]) -> Seek:
+    """Decode a cursor from :func:`encode_cursor`; the column is re-checked against the whitelist.
+
+    ``allowed_columns`` may map columns to their value type (``int``, ``str``,
+    ``bool`` or ``datetime``) so the cursor value is checked too; a plain
+    iterable treats every column but ``id`` as text. A tampered cursor raises
+    :class:`BadRequestError` instead of reaching the database.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        column, descending, value, last_id = raw["c"], raw["d"], raw["v"], raw["i"]
+        is_datetime = raw.get("t") == "dt"
+        if is_datetime:
+            value = datetime.fromisoformat(value)
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError) as exc:
+        raise BadRequestError("Invalid pagination cursor") from exc
+
+    if column != "id" and column not in set(allowed_columns):
+        raise BadRequestError("Invalid pagination cursor")
+    if isinstance(allowed_columns, Mapping):
+        expected = allowed_columns.get(column, int if column == "id" else str)
+    else:
+        expected = int if column == "id" else (datetime if is_datetime else str)
+    if (
+        not isinstance(descending, bool)
+        or not _cursor_value_matches(last_id, int)
+        or not _cursor_value_matches(value, expected)
+        or is_datetime != (expected is datetime)
+    ):
+        raise BadRequestError("Invalid pagination cursor")
+    return Seek(column=column, descending=descending, after=(value, last_id))
+
+
+def _resolve_seek(
+    cursor: str | None,
+    offset: int | None,
+    order_by: str | None,
+    allowed_order_cols: Iterable[str],
+) -> tuple[Seek | None, str | None]:
+    """Pick keyset or offset paging; returns (seek, sanitized order_by)."""
+    ob = sanitize_order_by(order_by, allowed_order_cols)
+    if offset is not None:
+        if cursor:
+            raise BadRequestError("cursor and offset cannot be combined")
+        return None, ob
+
+    if cursor:
+        seek = decode_cursor(cursor, allowed_order_cols)
+        if ob and _split_order_by(ob) != (seek.column, seek.descending):
+            raise BadRequestError("cursor does not match order_by")
+        return seek, None
+
+    column, descending = _split_order_by(ob)
+    return Seek(column=column, descending=descending), None
+
+
+def _set_next_cursor(response: Response | None, seek: Seek | None, items: list[Any], limit: int | None) -> None:
+    # A full page means there may be more rows; hand out the position after the last one.
+    if response is None or seek is None or not limit or len(items) < limit:
+        return
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(seek, items[-1])
+
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def requested_stream_format(request: Request, stream: str | None) -> str | None:
+    """Return ``ndjson``/``csv`` if the client asked for a streamed export, else None.
+
+    ``?stream=1|ndjson|csv`` wins over the ``Accept`` header; ``?stream=0`` disables it.
+    """
+    if stream is not None:
+        value = stream.strip().lower()
+        if value in STREAM_MEDIA_TYPES:
+            return value
+        return "ndjson" if _parse_bool(value) else None
+
+    accept = request.headers.get("accept", "")
+    if "application/x-ndjson" in accept:
+        return "ndjson"
+    if "text/csv" in accept:
+        return "csv"
+    return None
+
+
+def _item_to_row(item: Any) -> dict[str, Any]:
+    if hasattr(item, "model_dump"):
+        return item.model_dump(mode="json")
+    return dict(item)
+
+
+def _encode_ndjson(batch: list[Any]) -> str:
+    # One write per batch keeps the per-row cost to the JSON encoding itself.
+    return "".join(
+        (item.model_dump_json() if hasattr(item, "model_dump_json") else json.dumps(item, default=str)) + "\n"
+        for item in batch
+    )
+
+
+class _CsvEncoder:
+    """Incremental CSV writer; the header is taken from the first row."""
+
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer: csv.DictWriter | None = None
+
+    def encode(self, batch: list[Any]) -> str:
+        for item in batch:
+            row = _item_to_row(item)
+            if self._writer is None:
+                self._writer = csv.DictWriter(self._buffer, fieldnames=list(row))
+                self._writer.writeheader()
+            self._writer.writerow(row)
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+
+def _make_batch_encoder(fmt: str) -> Callable[[list[Any]], str]:
+    return _CsvEncoder().encode if fmt == "csv" else _encode_ndjson
+
+
+def stream_response(batches: Iterator[list[Any]], fmt: str) -> StreamingResponse:
+    encode = _make_batch_encoder(fmt)
+    return StreamingResponse((encode(batch) for batch in batches), media_type=STREAM_MEDIA_TYPES[fmt])
+
+
+def async_stream_response(batches: AsyncIterator[list[Any]], fmt: str) -> StreamingResponse:
+    encode = _make_batch_encoder(fmt)
+
+    async def body() -> AsyncIterator[str]:
+        async for batch in batches:
+            yield encode(batch)
+
+    return StreamingResponse(body(), media_type=STREAM_MEDIA_TYPES[fmt])
+
+
 # Factories returning FastAPI handlers
 
 def make_list_route(
@@ -98,16 +284,34 @@ def make_list_route(
     *,
     allowed_filters: Iterable[str] | Mapping[str, Callable[[str], Any] | type],
     allowed_order_cols: Iterable[str],
-) -> Callable[[Request, int | None, int | None, str | None], list[Any]]:
+    stream_func: Callable[..., Iterator[list[Any]]] | None = None,
+) -> Callable[..., list[Any] | Response]:
+    """Build a list handler paging by keyset (``cursor``) or, if given, by raw ``offset``.
+
+    Keyset pages order by the requested column plus ``id`` and publish the token
+    for the following page in the ``X-Next-Cursor`` response header. With a
+    ``stream_func`` the handler can also stream the result as NDJSON or CSV.
+    """
     def route(
         request: Request,
         limit: int | None = None,
         offset: int | None = None,
         order_by: str | None = None,
-    ) -> list[Any]:
+        cursor: str | None = None,
+        response: Response | None = None,
+        stream: str | None = None,
+    ) -> list[Any] | Response:
         where = build_where_from_request(request, allowed_filters)
-        ob = sanitize_order_by(order_by, allowed_order_cols)
-        return list_func(where=where or None, limit=limit, offset=offset, order_by=ob)
+        seek, ob = _resolve_seek(cursor, offset, order_by, allowed_order_cols)
+        fmt = requested_stream_format(request, stream) if stream_func else None
+        if fmt:
+            if offset is not None:
+                raise BadRequestError("offset is not supported when streaming; use cursor")
+            return stream_response(stream_func(where=where or None, limit=limit, order_by=ob, seek=seek), fmt)
+
+        items = list_func(where=where or None, limit=limit, offset=offset, order_by=ob, seek=seek)
+        _set_next_cursor(response, seek, items, limit)
+        return items
 
     return route
 
@@ -148,3 +352,76 @@ def make_delete_route(delete_func: Callable[[int], int]) -> Callable[[int], Resp
 
     return route
 
+
+# Async factories for handlers backed by AsyncRepository
+
+def make_async_list_route(
+    list_func: Callable[..., Awaitable[list[Any]]],
+    *,
+    allowed_filters: Iterable[str] | Mapping[str, Callable[[str], Any] | type],
+    allowed_order_cols: Iterable[str],
+    stream_func: Callable[..., AsyncIterator[list[Any]]] | None = None,
+) -> Callable[..., Awaitable[list[Any] | Response]]:
+    async def route(
+        request: Request,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_by: str | None = None,
+        cursor: str | None = None,
+        response: Response | None = None,
+        stream: str | None = None,
+    ) -> list[Any] | Response:
+        where = build_where_from_request(request, allowed_filters)
+        seek, ob = _resolve_seek(cursor, offset, order_by, allowed_order_cols)
+        fmt = requested_stream_format(request, stream) if stream_func else None
+        if fmt:
+            if offset is not None:
+                raise BadRequestError("offset is not supported when streaming; use cursor")
+            return async_stream_response(stream_func(where=where or None, limit=limit, order_by=ob, seek=seek), fmt)
+
+        items = await list_func(where=where or None, limit=limit, offset=offset, order_by=ob, seek=seek)
+        _set_next_cursor(response, seek, items, limit)
+        return items
+
+    return route
+
+
+def make_async_get_route(get_by_id_func: Callable[[int], Awaitable[Any]]) -> Callable[[int], Awaitable[Any]]:
+    async def route(entity_id: int) -> Any:
+        entity = await get_by_id_func(entity_id)
+        if not entity:
+            raise NotFoundError(f"Entity {entity_id} not found")
+        return entity
+
+    return route
+
+
+def make_async_create_route(
+    create_func: Callable[[Any], Awaitable[Any]], model_create: type
+) -> Callable[[Any], Awaitable[Any]]:
+    async def route(payload: model_create):  # type: ignore[valid-type]
+        return await create_func(payload)
+
+    return route
+
+
+def make_async_update_route(
+    update_func: Callable[[int, Any], Awaitable[Any]], model_update: type
+) -> Callable[[int, Any], Awaitable[Any]]:
+    async def route(entity_id: int, payload: model_update):  # type: ignore[valid-type]
+        entity = await update_func(entity_id, payload)
+        if not entity:
+            raise NotFoundError(f"Entity {entity_id} not found")
+        return entity
+
+    return route
+
+
+def make_async_delete_route(delete_func: Callable[[int], Awaitable[int]]) -> Callable[[int], Awaitable[Response]]:
+    async def route(entity_id: int) -> Response:
+        affected = await delete_func(entity_id)
+        if affected == 0:
+            raise NotFoundError(f"Entity {entity_id} not found")
+        return Response(status_code=AppHttpStatus.NO_CONTENT)
+
+    return route
@@ -4,19 +4,15 @@ from fastapi import APIRouter, HTTPException, Depends
 from fastapi.concurrency import run_in_threadpool
 import psycopg
 
-from app.database import DatabaseConfigurationError, get_connector
+from app.core.responses import TrustedResponseRoute
+from app.database import DatabaseConfigurationError, get_backend, pool_stats
 from app.util.security import require_roles
 
-router = APIRouter(prefix="/database", tags=["database"])
+router = APIRouter(prefix="/database", tags=["database"], route_class=TrustedResponseRoute)
 
 
 async def _fetch_table_names() -> list[str]:
-    connector = get_connector()
-
-    def _collect() -> list[str]:
-        return list(connector.iter_user_tables())
-
-    return await run_in_threadpool(_collect)
+    return await run_in_threadpool(get_backend().table_names)
 
 
 @router.get("/tables", summary="List database tables", dependencies=[Depends(require_roles("admin"))])
@@ -27,3 +23,9 @@ async def list_tables() -> dict[str, list[str]]:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     return {"tables": tables}
+
+
+@router.get("/pool", summary="Connection pool statistics", dependencies=[Depends(require_roles("admin"))])
+async def read_pool_stats() -> dict[str, dict]:
+    """Expose psycopg pool counters: waits, timeouts, usage and current size."""
+    return pool_stats()
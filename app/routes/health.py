@@ -1,10 +1,30 @@
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+import psycopg
+from psycopg_pool import PoolTimeout
+
+from app.core.exceptions import DependencyFailedError
+from app.core.responses import TrustedResponseRoute
+from app.database import DatabaseConfigurationError, DatabaseUnavailableError, get_backend
 from app.util.security import require_roles
 
-router = APIRouter()
+router = APIRouter(route_class=TrustedResponseRoute)
 
 
 @router.get("/health", summary="Container liveness check", dependencies=[Depends(require_roles("admin"))])
 async def health() -> dict[str, str]:
     """Expose a lightweight endpoint useful for container health checks."""
     return {"status": "ok"}
+
+
+@router.get("/health/ready", summary="Readiness check")
+async def ready() -> dict[str, str]:
+    """Report ready only when the storage backend answers (``SELECT 1`` on a pooled connection).
+
+    Unauthenticated so load balancers and orchestrators can probe it.
+    """
+    try:
+        await run_in_threadpool(get_backend().ping)
+    except (DatabaseConfigurationError, DatabaseUnavailableError, PoolTimeout, psycopg.Error) as exc:
+        raise DependencyFailedError("Database not reachable") from exc
+    return {"status": "ready"}
@@ -4,70 +4,42 @@ import logging
 import os
 
 from fastapi import APIRouter, Response
+from fastapi.concurrency import run_in_threadpool
 
 from app.core.errors import AppHttpStatus
 from app.core.openapi import with_errors
-from app.core.mailer import send_mail
-from app.core.email_templates import render_action_email_html, render_action_email_text
+from app.core.responses import TrustedResponseRoute
+from app.core.outbox import OutgoingMail, outbox
+from app.core.email_templates import render_email
 from app.models.auth import EmailRequest
 from app.repositories import users as users_repo
 
 
-router = APIRouter(prefix="/mailer", tags=["mailer"])
+router = APIRouter(prefix="/mailer", tags=["mailer"], route_class=TrustedResponseRoute)
 
 
 @router.post(
     "/forgot-password-email",
     status_code=AppHttpStatus.NO_CONTENT,
     response_class=Response,
-    responses=with_errors({AppHttpStatus.NO_CONTENT: {"description": "Email sent if user exists"}}),
+    responses=with_errors({AppHttpStatus.NO_CONTENT: {"description": "Email queued if user exists"}}),
 )
-def forgot_password_email(payload: EmailRequest) -> Response:
-    """Trigger a password reset email. Returns 204 regardless of existence.
+async def forgot_password_email(payload: EmailRequest) -> Response:
+    """Queue a password reset email. Returns 204 regardless of existence.
 
-    This avoids leaking whether an email is registered.
+    This avoids leaking whether an email is registered. Delivery happens on the
+    mail outbox workers, so the response does not wait for SMTP.
     """
     try:
-        user = users_repo.get_one({"email": payload.email})
+        user = await run_in_threadpool(users_repo.get_one, {"email": payload.email})
         if user:
             base_url = os.getenv("APP_BASE_URL", os.getenv("FRONTEND_URL", "http://localhost:3000")).rstrip("/")
             reset_link = f"{base_url}/reset-password?email={payload.email}"
-            subject = "Passwort zurücksetzen"
-            text = (
-                "Wir haben eine Anfrage zum zurücksetzen deines Passworts erhalten.\n\n"
-                f"Falls du das warst, klicke auf den folgenden Link:\n{reset_link}\n\n"
-                "Wenn du diese Anfrage nicht gestellt hast, kannst du diese E-Mail ignorieren."
-            )
-            # Beautified email using HTML template
-            subject = "Passwort zurücksetzen"
-            heading = "Passwort zurücksetzen"
-            body_lines = [
-                "Wir haben eine Anfrage zum Zurücksetzen deines Passworts erhalten.",
-                "Wenn du das warst, klicke auf den Button unten.",
-                "Wenn du diese Anfrage nicht gestellt hast, ignoriere diese E‑Mail.",
-            ]
-            footer_lines = [
-                "Aus Sicherheitsgründen läuft der Link nach einiger Zeit ab.",
-            ]
-            text = render_action_email_text(
-                heading=heading,
-                body_lines=body_lines,
-                action_text="Passwort jetzt zurücksetzen",
-                action_url=reset_link,
-                footer_lines=footer_lines,
-            )
-            html = render_action_email_html(
-                title=subject,
-                heading=heading,
-                body_lines=body_lines,
-                action_text="Passwort jetzt zurücksetzen",
-                action_url=reset_link,
-                footer_lines=footer_lines,
-            )
-            send_mail(to=payload.email, subject=subject, text=text, html=html)
+            email = render_email("password_reset", user.language.value, action_url=reset_link)
+            outbox.enqueue(OutgoingMail(to=payload.email, subject=email.subject, text=email.text, html=email.html))
     except Exception:
         # Do not leak internal errors; still return 204 to the client
-        logging.exception("Failed to send forgot-password email")
+        logging.exception("Failed to queue forgot-password email")
     return Response(status_code=AppHttpStatus.NO_CONTENT)
 
 
@@ -75,42 +47,20 @@ def forgot_password_email(payload: EmailRequest) -> Response:
     "/verification-email",
     status_code=AppHttpStatus.NO_CONTENT,
     response_class=Response,
-    responses=with_errors({AppHttpStatus.NO_CONTENT: {"description": "Verification email sent if user exists"}}),
+    responses=with_errors({AppHttpStatus.NO_CONTENT: {"description": "Verification email queued if user exists"}}),
 )
-def send_verification_email(payload: EmailRequest) -> Response:
-    """Send a verification email for a user account.
+async def send_verification_email(payload: EmailRequest) -> Response:
+    """Queue a verification email for a user account.
 
     Always returns 204 to avoid user enumeration.
     """
     try:
-        user = users_repo.get_one({"email": payload.email})
+        user = await run_in_threadpool(users_repo.get_one, {"email": payload.email})
         if user and not user.verified:
             base_url = os.getenv("APP_BASE_URL", os.getenv("FRONTEND_URL", "http://localhost:3000")).rstrip("/")
             verify_link = f"{base_url}/verify?email={payload.email}"
-            subject = "E-Mail-Adresse bestätigen"
-            heading = "E-Mail bestätigen"
-            body_lines = [
-                "Bitte bestätige deine E-Mail-Adresse, um dein Konto zu aktivieren.",
-            ]
-            footer_lines = [
-                f"Falls du dich nicht registriert hast, ignoriere diese E-Mail.",
-            ]
-            text = render_action_email_text(
-                heading=heading,
-                body_lines=body_lines,
-                action_text="E-Mail jetzt bestätigen",
-                action_url=verify_link,
-                footer_lines=footer_lines,
-            )
-            html = render_action_email_html(
-                title=subject,
-                heading=heading,
-                body_lines=body_lines,
-                action_text="E-Mail jetzt bestätigen",
-                action_url=verify_link,
-                footer_lines=footer_lines,
-            )
-            send_mail(to=payload.email, subject=subject, text=text, html=html)
+            email = render_email("verify_email", user.language.value, action_url=verify_link)
+            outbox.enqueue(OutgoingMail(to=payload.email, subject=email.subject, text=email.text, html=email.html))
     except Exception:
-        logging.exception("Failed to send verification email")
+        logging.exception("Failed to queue verification email")
     return Response(status_code=AppHttpStatus.NO_CONTENT)
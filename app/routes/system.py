@@ -1,10 +1,35 @@
-from fastapi import APIRouter
+from typing import Any
 
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 
-router = APIRouter(prefix="/system", tags=["system"])
+from app.core.metrics import registry
+from app.core.responses import TrustedResponseRoute
+from app.core.stats import collect_stats
+from app.util.security import require_roles
+
+
+router = APIRouter(prefix="/system", tags=["system"], route_class=TrustedResponseRoute)
 
 
 @router.get("/", summary="SpaceBattle welcome message")
 async def read_root() -> dict[str, str]:
     """Return a simple greeting to confirm the API is reachable."""
     return {"message": "Welcome to the SpaceBattle API"}
+
+
+@router.get("/stats", summary="Runtime cache statistics", dependencies=[Depends(require_roles("admin"))])
+async def read_stats() -> dict[str, Any]:
+    """Expose hit rates and counters of the in-process caches."""
+    return collect_stats()
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_roles("admin"))],
+)
+def read_metrics() -> PlainTextResponse:
+    """Expose request, database pool and cache metrics in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
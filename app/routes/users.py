@@ -1,11 +1,23 @@
 ﻿from __future__ import annotations
 
+import os
+from datetime import datetime
+
 from fastapi import APIRouter, Response, Request, Depends
 
-from app.core.exceptions import ForbiddenError, NotFoundError
+from app.core.exceptions import ForbiddenError, NotFoundError, PayloadTooLargeError
 from app.core.openapi import with_errors
-from app.core.errors import AppHttpStatus
-from app.models.users import User, UserCreate, UserUpdate
+from app.core.responses import TrustedResponseRoute
+from app.core.errors import AppHttpStatus, ErrorResponse
+from app.models.users import (
+    User,
+    UserBulkItem,
+    UserBulkMode,
+    UserBulkResult,
+    UserBulkStatus,
+    UserCreate,
+    UserUpdate,
+)
 from app.repositories import users as repo
 from app.util.security import require_roles
 from app.routes.crud_helpers import (
@@ -16,7 +28,9 @@ from app.routes.crud_helpers import (
     make_delete_route,
 )
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=TrustedResponseRoute)
+
+BULK_MAX_ROWS = int(os.getenv("USERS_BULK_MAX_ROWS", "10000"))
 
 
 allowed_filters = {
@@ -28,22 +42,41 @@ allowed_filters = {
     "blocked": bool,
 }
 
-allowed_order_cols = {"id", "name", "email", "created_at", "role", "verified", "blocked"}
+# Column -> value type, also used to validate pagination cursors.
+allowed_order_cols = {
+    "id": int,
+    "name": str,
+    "email": str,
+    "created_at": datetime,
+    "role": str,
+    "verified": bool,
+    "blocked": bool,
+}
 
 list_users_handler = make_list_route(
     repo.list_users,
     allowed_filters=allowed_filters,
     allowed_order_cols=allowed_order_cols,
+    stream_func=repo.stream_users,
 )
 
-@router.get("/", response_model=list[User], responses=with_errors())
+@router.get(
+    "/",
+    response_model=list[User],
+    responses=with_errors({
+        200: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+    }),
+)
 def list_users(
     request: Request,
+    response: Response,
     limit: int | None = None,
     offset: int | None = None,
     order_by: str | None = None,
+    cursor: str | None = None,
+    stream: str | None = None,
 ) -> list[User]:
-    return list_users_handler(request, limit, offset, order_by)
+    return list_users_handler(request, limit, offset, order_by, cursor, response, stream)
 
 
 get_user_handler = make_get_route(repo.get_by_id)
@@ -60,6 +93,50 @@ def create_user(payload: UserCreate) -> User:
     return create_user_handler(payload)
 
 
+@router.post(
+    "/bulk",
+    response_model=UserBulkResult,
+    responses=with_errors({413: {"model": ErrorResponse}}),
+    dependencies=[Depends(require_roles("admin"))],
+)
+def bulk_create_users(payload: list[UserCreate], mode: UserBulkMode = UserBulkMode.insert) -> UserBulkResult:
+    """Create many users at once; existing emails are reported per row instead of failing the batch.
+
+    ``upsert`` overwrites users with a matching email, ``copy`` streams through COPY
+    for seeding and aborts on the first conflict.
+    """
+    if len(payload) > BULK_MAX_ROWS:
+        raise PayloadTooLargeError(
+            f"Bulk requests are limited to {BULK_MAX_ROWS} rows",
+            details={"rows": len(payload), "max_rows": BULK_MAX_ROWS},
+        )
+
+    if mode is UserBulkMode.copy:
+        copied = repo.copy_create(payload)
+        return UserBulkResult(inserted=copied, updated=0, conflicts=0, items=[])
+
+    result = repo.bulk_create(payload, upsert=mode is UserBulkMode.upsert)
+    items = [
+        UserBulkItem(index=index, email=user.email, status=UserBulkStatus.inserted, id=user.id)
+        for index, user in result.inserted
+    ]
+    items.extend(
+        UserBulkItem(index=index, email=user.email, status=UserBulkStatus.updated, id=user.id)
+        for index, user in result.updated
+    )
+    items.extend(
+        UserBulkItem(index=c.index, email=str(c.value), status=UserBulkStatus.conflict, reason=c.reason)
+        for c in result.conflicts
+    )
+    items.sort(key=lambda item: item.index)
+    return UserBulkResult(
+        inserted=len(result.inserted),
+        updated=len(result.updated),
+        conflicts=len(result.conflicts),
+        items=items,
+    )
+
+
 update_user_handler = make_update_route(repo.update, UserUpdate)
 
 @router.patch("/{user_id}", response_model=User, responses=with_errors())
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+MISSING: Any = object()
+"""Returned by :meth:`TTLCache.get` when the key is absent or expired."""
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe bounded cache with per-entry TTL and LRU eviction.
+
+    Sync routes run on AnyIO worker threads, so every operation takes a lock;
+    the critical sections are a dict lookup and an ``OrderedDict`` move.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        if max_size < 0:
+            raise ValueError("max_size must not be negative")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0 and self._ttl > 0
+
+    def get(self, key: K) -> V:
+        """Return the cached value or :data:`MISSING`."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: K) -> V:
+        """Return the cached value without touching LRU order or counters."""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return MISSING
+        return entry[1]
+
+    def set(self, key: K, value: V, *, ttl: float | None = None, expires_at: float | None = None) -> None:
+        """Store ``value``; ``expires_at`` is a ``time.monotonic()`` deadline overriding ``ttl``."""
+        if not self.enabled:
+            return
+        if expires_at is None:
+            expires_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: K) -> V:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return MISSING
+            self.invalidations += 1
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, float | int]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self._max_size,
+            "ttl": self._ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
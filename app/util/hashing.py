@@ -0,0 +1,42 @@
+"""Raw bcrypt primitives.
+
+Kept free of application imports so process-pool workers can unpickle them
+without loading FastAPI, the database layer or the route modules.
+"""
+from __future__ import annotations
+
+import time
+
+import bcrypt
+
+MIN_BCRYPT_COST = 4
+MAX_BCRYPT_COST = 31
+
+
+def bcrypt_hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def bcrypt_check(plain_password: str, password_hash: str) -> bool:
+    try:
+        return bcrypt.checkpw(plain_password.encode("utf-8"), password_hash.encode("utf-8"))
+    except ValueError:
+        return False
+
+
+def bcrypt_cost(password_hash: str) -> int | None:
+    """Return the work factor encoded in a ``$2b$12$...`` hash, or None if unparsable."""
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def measure_bcrypt_cost(rounds: int, samples: int = 3) -> float:
+    """Return the best-of-``samples`` hash duration in milliseconds at ``rounds``."""
+    best = float("inf")
+    for _ in range(max(samples, 1)):
+        started = time.perf_counter()
+        bcrypt_hash("calibration-password", rounds)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
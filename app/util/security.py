@@ -1,28 +1,199 @@
 from __future__ import annotations
 
-import bcrypt
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable
 
+from app.util.hashing import bcrypt_check, bcrypt_cost, bcrypt_hash, measure_bcrypt_cost
 from app.util.token import extract_bearer_token
 from fastapi import Request
 from app.core.auth import get_current_user_role
-from app.core.exceptions import ForbiddenError, UnauthorizedError
+from app.core.exceptions import ForbiddenError, ServiceUnavailableError, UnauthorizedError
+from app.core.stats import register_stats_provider
+
+# bcrypt releases the GIL, so threads already scale with cores; "process" isolates
+# hashing from the server process entirely.
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread").lower()
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1)
+# Hash jobs allowed to wait or run at once before new ones are rejected with 503.
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# Work factor used for new hashes. With BCRYPT_TARGET_MS set, startup calibration
+# picks the highest cost within [BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS] that stays
+# under the target on this machine.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS") or 0)
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "16"))
+# Shared calibration result: the first worker to calibrate writes it, others
+# (and later restarts) reuse it so every worker hashes with the same cost.
+BCRYPT_CALIBRATION_FILE = os.getenv("BCRYPT_CALIBRATION_FILE") or None
+
+logger = logging.getLogger("spacebattle.security")
+
+_executor: Executor | None = None
+_executor_lock = Lock()
+_pending = 0
+_rounds = BCRYPT_ROUNDS
+
 
 def hash_password(password: str) -> str:
     """Hash a plaintext password using bcrypt."""
     if not password:
         raise ValueError("Password must not be empty")
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-    return hashed.decode("utf-8")
+    return bcrypt_hash(password, _rounds)
 
 
 def verify_password(plain_password: str, password_hash: str) -> bool:
     """Verify a plaintext password against a bcrypt hash."""
     if not plain_password or not password_hash:
         return False
+    return bcrypt_check(plain_password, password_hash)
+
+
+def calibrate_bcrypt_cost(
+    target_ms: float,
+    *,
+    min_rounds: int = BCRYPT_MIN_ROUNDS,
+    max_rounds: int = BCRYPT_MAX_ROUNDS,
+) -> int:
+    """Return the highest cost in ``[min_rounds, max_rounds]`` hashing within ``target_ms``.
+
+    Never goes below ``min_rounds``, even on hardware too slow to meet the target.
+    """
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed = measure_bcrypt_cost(rounds)
+        if elapsed > target_ms:
+            break
+        chosen = rounds
+        # Each step doubles the work; stop before a certain overshoot.
+        if elapsed * 2 > target_ms:
+            break
+    return chosen
+
+
+def _load_calibration(path: str) -> int | None:
+    """Return the cost stored in ``path`` if it was calibrated for the current settings."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        rounds = data["rounds"]
+        if data["target_ms"] != BCRYPT_TARGET_MS or not isinstance(rounds, int):
+            return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return rounds if BCRYPT_MIN_ROUNDS <= rounds <= BCRYPT_MAX_ROUNDS else None
+
+
+def _store_calibration(path: str, rounds: int) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"target_ms": BCRYPT_TARGET_MS, "rounds": rounds}, fh)
+        os.replace(tmp, path)
+    except OSError:
+        logger.warning("Could not write bcrypt calibration to %s", path, exc_info=True)
+
+
+def configure_bcrypt_cost() -> int:
+    """Apply BCRYPT_TARGET_MS calibration (if configured) and return the active cost."""
+    global _rounds
+
+    if BCRYPT_TARGET_MS > 0:
+        shared = _load_calibration(BCRYPT_CALIBRATION_FILE) if BCRYPT_CALIBRATION_FILE else None
+        if shared is not None:
+            _rounds = shared
+            logger.info("bcrypt cost %s loaded from %s", _rounds, BCRYPT_CALIBRATION_FILE)
+        else:
+            _rounds = calibrate_bcrypt_cost(BCRYPT_TARGET_MS)
+            logger.info("bcrypt cost calibrated to %s for a %.0f ms target", _rounds, BCRYPT_TARGET_MS)
+            if BCRYPT_CALIBRATION_FILE:
+                _store_calibration(BCRYPT_CALIBRATION_FILE, _rounds)
+    return _rounds
+
+
+def get_bcrypt_rounds() -> int:
+    return _rounds
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True if ``password_hash`` was produced with a cost below the active one.
+
+    Hashes are only ever upgraded: workers that calibrated to different costs
+    must not keep rehashing each other's hashes back and forth.
+    """
+    cost = bcrypt_cost(password_hash)
+    return cost is not None and cost < _rounds
+
+
+def _get_executor() -> Executor:
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if PASSWORD_HASH_EXECUTOR == "process":
+                    _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+                else:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=PASSWORD_HASH_WORKERS,
+                        thread_name_prefix="bcrypt",
+                    )
+    return _executor
+
+
+def shutdown_password_executor() -> None:
+    """Stop the hashing pool; called from the application lifespan."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run_hash_job(func: Callable[..., Any], *args: Any) -> Any:
+    # Only touched from the event loop, so the counter needs no lock.
+    global _pending
+
+    if _pending >= PASSWORD_HASH_MAX_PENDING:
+        raise ServiceUnavailableError("Password hashing capacity exhausted, retry shortly")
+    _pending += 1
     try:
-        return bcrypt.checkpw(plain_password.encode("utf-8"), password_hash.encode("utf-8"))
-    except ValueError:
+        return await asyncio.wrap_future(_get_executor().submit(func, *args))
+    finally:
+        _pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bounded hashing pool without blocking the event loop."""
+    if not password:
+        raise ValueError("Password must not be empty")
+    return await _run_hash_job(bcrypt_hash, password, _rounds)
+
+
+async def verify_password_async(plain_password: str, password_hash: str) -> bool:
+    """Verify a password on the bounded hashing pool without blocking the event loop."""
+    if not plain_password or not password_hash:
         return False
+    return await _run_hash_job(bcrypt_check, plain_password, password_hash)
+
+
+def password_hash_stats() -> dict[str, Any]:
+    return {
+        "rounds": _rounds,
+        "executor": PASSWORD_HASH_EXECUTOR,
+        "workers": PASSWORD_HASH_WORKERS,
+        "max_pending": PASSWORD_HASH_MAX_PENDING,
+        "pending": _pending,
+    }
+
+
+register_stats_provider("password_hash", password_hash_stats)
 
 def check_role(request: Request, required: list[str]) -> bool:
     token = extract_bearer_token(request)
@@ -0,0 +1 @@
+"""Standalone performance benchmarks; run modules with ``python -m benchmarks.<name>``."""
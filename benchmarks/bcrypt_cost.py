@@ -0,0 +1,32 @@
+"""Print bcrypt cost vs. latency on this machine.
+
+    python -m benchmarks.bcrypt_cost --min 10 --max 14 --target-ms 250
+"""
+from __future__ import annotations
+
+import argparse
+
+from app.util.hashing import measure_bcrypt_cost
+from app.util.security import BCRYPT_MAX_ROUNDS, BCRYPT_MIN_ROUNDS, calibrate_bcrypt_cost
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min", type=int, default=BCRYPT_MIN_ROUNDS, help="lowest cost to measure")
+    parser.add_argument("--max", type=int, default=BCRYPT_MAX_ROUNDS, help="highest cost to measure")
+    parser.add_argument("--samples", type=int, default=3, help="hashes per cost (best is reported)")
+    parser.add_argument("--target-ms", type=float, default=None, help="also show the calibrated cost")
+    args = parser.parse_args()
+
+    print(f"{'cost':>4}  {'ms/hash':>10}  {'hashes/s/core':>14}")
+    for rounds in range(args.min, args.max + 1):
+        elapsed_ms = measure_bcrypt_cost(rounds, args.samples)
+        print(f"{rounds:>4}  {elapsed_ms:>10.1f}  {1000 / elapsed_ms:>14.1f}")
+
+    if args.target_ms:
+        chosen = calibrate_bcrypt_cost(args.target_ms, min_rounds=args.min, max_rounds=args.max)
+        print(f"\ncalibrated cost for {args.target_ms:.0f} ms target: {chosen}")
+
+
+if __name__ == "__main__":
+    main()
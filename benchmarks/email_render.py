@@ -0,0 +1,58 @@
+"""Compare per-call email rendering against the pre-rendered template registry.
+
+    python -m benchmarks.email_render --seconds 1
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.core.email_templates import EMAIL_CONTENT, render_action_email_html, render_action_email_text, templates
+
+ACTION_URL = "http://localhost:3000/reset-password?email=player@example.com"
+
+
+def _full_render(content) -> None:
+    render_action_email_text(
+        heading=content.heading,
+        body_lines=content.body_lines,
+        action_text=content.action_text,
+        action_url=ACTION_URL,
+        footer_lines=content.footer_lines,
+    )
+    render_action_email_html(
+        title=content.subject,
+        heading=content.heading,
+        body_lines=content.body_lines,
+        action_text=content.action_text,
+        action_url=ACTION_URL,
+        footer_lines=content.footer_lines,
+    )
+
+
+def _rate(fn, seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            fn()
+        count += 100
+    return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=1.0, help="measurement time per case")
+    args = parser.parse_args()
+
+    print(f"{'template':<16} {'lang':<4}  {'full/s':>10}  {'registry/s':>11}  {'speedup':>7}")
+    for name, languages in EMAIL_CONTENT.items():
+        for language, content in languages.items():
+            full = _rate(lambda: _full_render(content), args.seconds)
+            cached = _rate(lambda: templates.render(name, language, action_url=ACTION_URL), args.seconds)
+            print(f"{name:<16} {language:<4}  {full:>10.0f}  {cached:>11.0f}  {cached / full:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Seeded :class:`app.database.backends.MemoryBackend` for the benchmarks.
+
+With no server round-trip, the measured cost is the application code around
+the database (query dispatch, parameter handling, model construction).
+``id`` and ``email`` lookups hit the backend's hash indexes and updates are
+applied, so the load harness can log in and patch users.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator, Sequence
+
+from app.database.backends import MemoryBackend, set_backend
+
+
+def user_rows(count: int) -> list[dict[str, Any]]:
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": i,
+            "name": f"pilot{i}",
+            "email": f"pilot{i}@example.com",
+            "verified": True,
+            "blocked": False,
+            "role": "player",
+            "language": "de" if i % 2 else "en",
+            "created_at": created,
+            "password_hash": "$2b$12$" + "x" * 53,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+@contextmanager
+def fixture_db(rows: Sequence[dict[str, Any]]) -> Iterator[MemoryBackend]:
+    """Install a memory backend seeded with user ``rows`` for the duration of the block."""
+    backend = MemoryBackend()
+    backend.load("users", rows)
+    previous = set_backend(backend)
+    try:
+        yield backend
+    finally:
+        set_backend(previous)
@@ -0,0 +1,248 @@
+"""Closed-loop load generator for ``app.main:app``.
+
+``--concurrency`` virtual users repeat a scenario until ``--duration`` runs out.
+Requests go through an in-process ASGI transport (lifespan included) or, with
+``--url``, to a running server, e.g. ``uvicorn app.main:app --workers 4``.
+Throughput, p50/p95/p99 latency and error rate are reported per route.
+
+    python -m benchmarks.load --scenario mixed --db memory --concurrency 32 --duration 10
+    python -m benchmarks.load --scenario login --db postgres --seed --users 500
+    python -m benchmarks.load --scenario pagination --url http://127.0.0.1:8000
+
+``--db memory`` serves seeded users from the memory backend (framework
+overhead only) and ``--db sqlite`` from a seeded SQLite database
+(``DATABASE_SQLITE_PATH``, in-memory by default); ``--db postgres`` uses
+``DATABASE_URL``, where ``--seed`` upserts the load-test users first. Pool,
+cache and worker settings are the app's usual environment variables, so runs
+compare configurations.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+PASSWORD = "load-test-password"
+PAGE_SIZE = 50
+
+
+def _email(index: int) -> str:
+    return f"pilot{index}@example.com"
+
+
+@dataclass
+class RouteStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.routes: dict[str, RouteStats] = defaultdict(RouteStats)
+
+    def record(self, route: str, status: int, seconds: float) -> None:
+        stats = self.routes[route]
+        stats.latencies.append(seconds)
+        stats.statuses[status] += 1
+        # 0 = transport error (connection refused, timeout).
+        if status == 0 or status >= 400:
+            stats.errors += 1
+
+    def report(self, elapsed: float) -> str:
+        lines = [
+            f"{'route':<28} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}  statuses"
+        ]
+        total = errors = 0
+        for route in sorted(self.routes):
+            stats = self.routes[route]
+            latencies = sorted(stats.latencies)
+            count = len(latencies)
+            total += count
+            errors += stats.errors
+            statuses = " ".join(f"{code}:{n}" for code, n in sorted(stats.statuses.items()))
+            lines.append(
+                f"{route:<28} {count:>9} {count / elapsed:>9.1f} {_percentile(latencies, 50):>8.1f} "
+                f"{_percentile(latencies, 95):>8.1f} {_percentile(latencies, 99):>8.1f} "
+                f"{stats.errors / count:>7.1%}  {statuses}"
+            )
+        if total:
+            lines.append(f"\n{total} requests in {elapsed:.1f}s: {total / elapsed:.1f} req/s, error rate {errors / total:.1%}")
+        return "\n".join(lines)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile in milliseconds."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank] * 1000
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, users: int) -> None:
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.users = users
+        self.cursor: str | None = None
+
+    async def request(self, route: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 0
+        self.recorder.record(route, status, time.perf_counter() - started)
+        return response
+
+    def user_index(self) -> int:
+        return self.rng.randint(1, self.users)
+
+    async def login(self) -> None:
+        await self.request(
+            "POST /auth/login",
+            "POST",
+            "/auth/login",
+            json={"email": _email(self.user_index()), "password": PASSWORD},
+        )
+
+    async def pagination(self) -> None:
+        """Walk ``/users/`` page by page via ``X-Next-Cursor``, restarting at the end."""
+        params = {"limit": PAGE_SIZE, "order_by": "id"}
+        if self.cursor:
+            params["cursor"] = self.cursor
+        response = await self.request("GET /users/", "GET", "/users/", params=params)
+        self.cursor = response.headers.get("X-Next-Cursor") if response is not None else None
+
+    async def patch(self) -> None:
+        index = self.user_index()
+        await self.request(
+            "PATCH /users/{user_id}",
+            "PATCH",
+            f"/users/{index}",
+            json={"name": f"pilot{index}-{self.rng.randint(0, 9999)}"},
+        )
+
+    async def mailer(self) -> None:
+        await self.request(
+            "POST /mailer/forgot-password",
+            "POST",
+            "/mailer/forgot-password-email",
+            json={"email": _email(self.user_index())},
+        )
+
+    async def mixed(self) -> None:
+        step = self.rng.choices(
+            (self.pagination, self.patch, self.login, self.mailer),
+            weights=(60, 25, 10, 5),
+        )[0]
+        await step()
+
+
+SCENARIOS: dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "login": VirtualUser.login,
+    "pagination": VirtualUser.pagination,
+    "patch": VirtualUser.patch,
+    "mailer": VirtualUser.mailer,
+    "mixed": VirtualUser.mixed,
+}
+
+
+def _seed_rows(users: int) -> list[dict]:
+    from app.util.security import hash_password
+
+    from benchmarks.fixture_db import user_rows
+
+    password_hash = hash_password(PASSWORD)
+    rows = user_rows(users)
+    for row in rows:
+        row["password_hash"] = password_hash
+    return rows
+
+
+def _seed_database(users: int) -> None:
+    # A plain repository: users.bulk_create only takes UserCreate, which cannot set ``verified``.
+    from app.repositories.base import Repository
+    from app.repositories.users import _user_factory
+
+    repo = Repository(table="users", model_factory=_user_factory)
+    payloads = [
+        {"name": row["name"], "email": row["email"], "password_hash": row["password_hash"], "verified": True}
+        for row in _seed_rows(users)
+    ]
+    result = repo.upsert_many(payloads, conflict_key="email")
+    print(f"seeded {len(result.inserted)} new and {len(result.updated)} existing load-test users")
+
+
+async def _run_users(client: httpx.AsyncClient, args: argparse.Namespace) -> Recorder:
+    recorder = Recorder()
+    scenario = SCENARIOS[args.scenario]
+    deadline = time.perf_counter() + args.duration
+
+    async def loop(seed: int) -> None:
+        user = VirtualUser(client, recorder, random.Random(seed), args.users)
+        while time.perf_counter() < deadline:
+            await scenario(user)
+
+    await asyncio.gather(*(loop(args.seed + i) for i in range(args.concurrency)))
+    return recorder
+
+
+async def run(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30) as client:
+            started = time.perf_counter()
+            recorder = await _run_users(client, args)
+    else:
+        from app.main import app
+
+        stack = contextlib.ExitStack()
+        if args.db == "memory":
+            from benchmarks.fixture_db import fixture_db
+
+            stack.enter_context(fixture_db(_seed_rows(args.users)))
+        elif args.db == "sqlite" or args.seed_users:
+            _seed_database(args.users)
+        with stack:
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=30) as client:
+                    started = time.perf_counter()
+                    recorder = await _run_users(client, args)
+    print(recorder.report(time.perf_counter() - started))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--users", type=int, default=200, help="load-test accounts pilot1..N")
+    parser.add_argument("--db", choices=("memory", "sqlite", "postgres"), default="memory", help="in-process backend")
+    parser.add_argument("--seed", dest="seed_users", action="store_true", help="upsert load-test users (postgres)")
+    parser.add_argument("--random-seed", dest="seed", type=int, default=1, help="makes request sequences repeatable")
+    parser.add_argument("--url", help="target a running server instead of the in-process app")
+    parser.add_argument("--log-level", default="WARNING", help="app log level during the run")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so they must be in place before the app loads.
+    os.environ.setdefault("LOG_LEVEL", args.log_level)
+    os.environ.setdefault("MAIL_BACKEND", "memory")
+    os.environ.setdefault("DATABASE_BACKEND", args.db)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Log calls per second: the previous synchronous ``Logger`` vs. the queued one.
+
+Both write to a rotating file in a temporary directory; console output is
+redirected to ``os.devnull`` so terminal speed does not skew the numbers.
+
+    python -m benchmarks.logger --calls 20000
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+from app.logger import Logger, stop_log_listeners
+
+PAYLOADS = {
+    "str": "player joined the lobby",
+    "dict": {"event": "shot", "player": 42, "target": [3, 7], "hit": True, "ships": ["cruiser", "submarine"]},
+}
+
+
+class LegacyLogger:
+    """The synchronous implementation this benchmark compares against."""
+
+    def __init__(self, name: str, log_file: str) -> None:
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s -> %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        file_handler = RotatingFileHandler(log_file, maxBytes=5_000_000, backupCount=5, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        self.logger.addHandler(file_handler)
+        self.logger.addHandler(console_handler)
+
+    def log_info(self, message) -> None:
+        frame = inspect.stack()[1]
+        origin = f"{frame.filename.split('/')[-1]}:{frame.function}"
+        formatted = message if isinstance(message, str) else json.dumps(message, indent=2, ensure_ascii=False)
+        self.logger.info(f"{origin} -> {formatted}")
+
+
+def _rate(logger, message, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        logger.log_info(message)
+    return calls / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000, help="log calls per case")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        legacy = LegacyLogger("bench.legacy", os.path.join(tmp, "legacy.log"))
+        queued = Logger("bench.queued", os.path.join(tmp, "queued.log"))
+        results = {}
+        for kind, message in PAYLOADS.items():
+            results[kind] = (_rate(legacy, message, args.calls), _rate(queued, message, args.calls))
+        drain_started = time.perf_counter()
+        stop_log_listeners()
+        drain_ms = (time.perf_counter() - drain_started) * 1000
+
+    print(f"{'payload':<8}  {'legacy/s':>10}  {'queued/s':>10}  {'speedup':>7}")
+    for kind, (legacy_rate, queued_rate) in results.items():
+        print(f"{kind:<8}  {legacy_rate:>10.0f}  {queued_rate:>10.0f}  {queued_rate / legacy_rate:>6.1f}x")
+    print(f"\nlistener drained the remaining backlog in {drain_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
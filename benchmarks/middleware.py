@@ -0,0 +1,103 @@
+"""Per-request overhead of the request-context middleware.
+
+Drives a one-route Starlette app directly over ASGI (no server, no sockets)
+with no middleware, the previous ``BaseHTTPMiddleware`` implementation and the
+current pure-ASGI one.
+
+    python -m benchmarks.middleware --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.middleware import REQUEST_ID_HEADER, RequestContextMiddleware
+from app.core.request_context import request_scope
+
+
+class LegacyRequestIdMiddleware(BaseHTTPMiddleware):
+    """The ``BaseHTTPMiddleware`` version this benchmark compares against."""
+
+    async def dispatch(self, request, call_next):
+        request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        request.state.request_id = request_id
+        with request_scope(request_id):
+            response = await call_next(request)
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+
+
+async def _ping(request):
+    return JSONResponse({"ok": True})
+
+
+def _build(middleware: list[Middleware]) -> Starlette:
+    return Starlette(routes=[Route("/ping", _ping)], middleware=middleware)
+
+
+async def _drive(app, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+    request = {"type": "http.request", "body": b"", "more_body": False}
+    disconnect = {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    async def call() -> None:
+        messages = iter((request,))
+
+        async def receive():
+            return next(messages, disconnect)
+
+        await app(dict(scope), receive, send)
+
+    for _ in range(min(requests, 500)):
+        await call()
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="requests per variant")
+    args = parser.parse_args()
+
+    variants = {
+        "none": _build([]),
+        "base_http": _build([Middleware(LegacyRequestIdMiddleware)]),
+        "pure_asgi": _build([Middleware(RequestContextMiddleware)]),
+    }
+    results = {name: asyncio.run(_drive(app, args.requests)) for name, app in variants.items()}
+
+    baseline = results["none"]
+    print(f"{'variant':<10}  {'us/request':>10}  {'overhead us':>11}")
+    for name, us in results.items():
+        print(f"{name:<10}  {us:>10.1f}  {us - baseline:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Response serialisation cost for ``list[User]`` payloads of growing size.
+
+Drives a one-route FastAPI app directly over ASGI with a sync endpoint that
+returns pre-built users, so only the response path is measured: FastAPI's
+regular ``response_model`` handling (validation on a threadpool hop, dump to
+Python, ``json.dumps``) against :class:`TrustedResponseRoute` with
+:class:`FastJSONResponse` (one pydantic-core pass to bytes).
+
+    python -m benchmarks.responses --sizes 1 50 500 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from app.core.responses import FastJSONResponse, TrustedResponseRoute
+from app.models.users import User
+
+from benchmarks.fixture_db import user_rows
+
+
+def _build(users: list[User], route_class: type[APIRoute], response_class: type[JSONResponse]) -> FastAPI:
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/users", response_model=list[User])
+    def list_users() -> list[User]:
+        return users
+
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(router)
+    return app
+
+
+async def _drive(app: FastAPI, requests: int) -> tuple[float, int]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/users",
+        "raw_path": b"/users",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    request = {"type": "http.request", "body": b"", "more_body": False}
+    disconnect = {"type": "http.disconnect"}
+    body_size = 0
+
+    async def send(message):
+        nonlocal body_size
+        if message["type"] == "http.response.body":
+            body_size = len(message.get("body", b""))
+
+    async def call() -> None:
+        messages = iter((request,))
+
+        async def receive():
+            return next(messages, disconnect)
+
+        await app(dict(scope), receive, send)
+
+    for _ in range(min(requests, 20)):
+        await call()
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return (time.perf_counter() - started) / requests * 1e6, body_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 500, 5000], help="users per response")
+    parser.add_argument("--budget", type=float, default=1.0, help="approximate seconds per measurement")
+    args = parser.parse_args()
+
+    rows = user_rows(max(args.sizes))
+    print(f"{'users':>6}  {'body KiB':>8}  {'fastapi us':>11}  {'trusted us':>11}  {'speedup':>7}")
+    for size in args.sizes:
+        users = [User(**row) for row in rows[:size]]
+        regular = _build(users, APIRoute, JSONResponse)
+        trusted = _build(users, TrustedResponseRoute, FastJSONResponse)
+        # Scale request counts so each variant runs for roughly ``--budget`` seconds.
+        probe, _ = asyncio.run(_drive(regular, 5))
+        requests = max(10, int(args.budget * 1e6 / probe))
+        regular_us, body = asyncio.run(_drive(regular, requests))
+        trusted_us, trusted_body = asyncio.run(_drive(trusted, requests))
+        assert body == trusted_body, "variants must produce the same payload size"
+        print(f"{size:>6}  {body / 1024:>8.1f}  {regular_us:>11.1f}  {trusted_us:>11.1f}  {regular_us / trusted_us:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
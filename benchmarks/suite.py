@@ -0,0 +1,216 @@
+"""Microbenchmarks for the request hot path, compared against a stored baseline.
+
+Every case runs against the seeded memory backend from
+:mod:`benchmarks.fixture_db`, so no Postgres is needed. Each case is timed in ``--repeat`` rounds of an
+auto-ranged loop; the median round is reported as ops/sec. ``peak B/op`` is the
+tracemalloc high-water mark of one call, i.e. the transient allocation it needs.
+
+    python -m benchmarks.suite                      # run and compare with the baseline
+    python -m benchmarks.suite -k token -k select   # only matching cases
+    python -m benchmarks.suite --save-baseline      # record the current numbers
+
+Exits with status 1 when a case is slower or allocates more than ``--tolerance``
+relative to the baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from starlette.requests import Request
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+@dataclass
+class Case:
+    name: str
+    func: Callable[[], object]
+    # Operations performed per call of ``func`` (e.g. a batch of requests).
+    batch: int = 1
+
+
+def _request(path: str, query: bytes = b"", headers: list[tuple[bytes, bytes]] | None = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query,
+            "headers": headers or [],
+        }
+    )
+
+
+def build_cases() -> list[Case]:
+    from app.core.auth import _validate_token, create_access_token, verify_token
+    from app.core.email_templates import EMAIL_CONTENT, render_action_email_html, render_email
+    from app.database.core import build_select, build_update
+    from app.models.users import User, UserLanguage, UserRole
+    from app.repositories.base import Repository
+    from app.repositories.users import _user_factory
+    from app.routes.crud_helpers import build_where_from_request, sanitize_order_by
+    from app.util.security import require_roles
+
+    from benchmarks.fixture_db import user_rows
+
+    repo = Repository(table="users", model_factory=_user_factory, default_order_by="id")
+    rows = user_rows(200)
+    token = create_access_token(subject=1, role=UserRole.admin, language=UserLanguage.de)
+    verify_token(token)  # warm the token cache
+    auth_request = _request("/users", headers=[(b"authorization", f"Bearer {token}".encode())])
+    admin_only = require_roles("admin")
+    filter_request = _request("/users", b"name=pilot7&verified=true&role=player&limit=50&order_by=created_at%20desc")
+    filters = {"name": str, "email": str, "verified": bool, "role": UserRole}
+    content = EMAIL_CONTENT["password_reset"]["de"]
+    action_url = "http://localhost:3000/reset-password?email=pilot1@example.com"
+
+    cases = [
+        Case("build_select", lambda: build_select("users", where={"role": "player", "verified": True}, order_by="id", limit=50, offset=100)),
+        Case("build_update", lambda: build_update("users", {"name": "pilot", "language": "en"}, {"id": 7}, returning="*")),
+        Case("repository_list_50", lambda: repo.list(limit=50, offset=0)),
+        Case("repository_get_by_id", lambda: repo.get_by_id(7)),
+        # Rows per second turned into User models: trusted construction vs full validation.
+        Case("user_rows_trusted", lambda: [_user_factory(row) for row in rows], batch=len(rows)),
+        Case("user_rows_validated", lambda: [User.model_validate(row) for row in rows], batch=len(rows)),
+        Case("verify_token_cached", lambda: verify_token(token)),
+        Case("verify_token_decode", lambda: _validate_token(token)),
+        Case("require_roles", lambda: admin_only(auth_request)),
+        Case("build_where_from_request", lambda: build_where_from_request(filter_request, filters)),
+        Case("sanitize_order_by", lambda: sanitize_order_by("created_at desc", ("id", "name", "created_at"))),
+        Case("email_render_registry", lambda: render_email("password_reset", "de", action_url=action_url)),
+        Case(
+            "email_render_full",
+            lambda: render_action_email_html(
+                title=content.subject,
+                heading=content.heading,
+                body_lines=content.body_lines,
+                action_text=content.action_text,
+                action_url=action_url,
+                footer_lines=content.footer_lines,
+            ),
+        ),
+        _middleware_case(),
+    ]
+    return cases
+
+
+def _middleware_case(batch: int = 50) -> Case:
+    """Full middleware chain plus routing for ``GET /system/`` over raw ASGI."""
+    from app.main import app
+
+    loop = asyncio.new_event_loop()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/system/",
+        "raw_path": b"/system/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    request = {"type": "http.request", "body": b"", "more_body": False}
+    disconnect = {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    async def run() -> None:
+        for _ in range(batch):
+            messages = iter((request,))
+
+            async def receive():
+                return next(messages, disconnect)
+
+            await app(dict(scope), receive, send)
+
+    return Case("middleware_chain", lambda: loop.run_until_complete(run()), batch=batch)
+
+
+def measure(case: Case, repeat: int) -> dict[str, float]:
+    case.func()  # warm-up (caches, lazy imports)
+    timer = timeit.Timer(case.func)
+    loops, _ = timer.autorange()
+    rounds = timer.repeat(repeat=repeat, number=loops)
+    ops = loops * case.batch / statistics.median(rounds)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        case.func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"ops_per_sec": round(ops, 1), "peak_bytes": round((peak - before) / case.batch)}
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']:.0f} ops/s < baseline {base['ops_per_sec']:.0f}")
+        # Small absolute slack so a handful of bytes of noise does not fail the run.
+        if result["peak_bytes"] > base["peak_bytes"] * (1 + tolerance) + 256:
+            regressions.append(f"{name}: {result['peak_bytes']} B/op > baseline {base['peak_bytes']}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filters", action="append", default=[], help="only run cases containing this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timed rounds per case (median is reported)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to the baseline file")
+    args = parser.parse_args()
+
+    # Access and app logs would dominate the middleware case and flood the terminal.
+    logging.disable(logging.WARNING)
+
+    from benchmarks.fixture_db import fixture_db, user_rows
+
+    with fixture_db(user_rows(200)):
+        cases = [c for c in build_cases() if not args.filters or any(f in c.name for f in args.filters)]
+        results = {case.name: measure(case, args.repeat) for case in cases}
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    print(f"{'case':<26}  {'ops/sec':>12}  {'baseline':>12}  {'change':>7}  {'peak B/op':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = f"{result['ops_per_sec'] / base['ops_per_sec'] - 1:+.0%}" if base else "new"
+        base_ops = f"{base['ops_per_sec']:.0f}" if base else "-"
+        print(f"{name:<26}  {result['ops_per_sec']:>12.0f}  {base_ops:>12}  {change:>7}  {result['peak_bytes']:>10}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nregressions:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())